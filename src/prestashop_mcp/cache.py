@@ -0,0 +1,41 @@
+"""Small in-process caches shared by the PrestaShop client and MCP server."""
+
+import time
+
+# Sentinel returned for absent entries so None can be cached as a value
+MISSING = object()
+
+
+class TTLCache:
+    """Small bounded cache whose entries expire after a fixed time-to-live."""
+    
+    def __init__(self, ttl: float, maxsize: int = 64):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = {}
+    
+    def get(self, key):
+        """Return the cached value for key, or MISSING if absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISSING
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return MISSING
+        return value
+    
+    def set(self, key, value) -> None:
+        """Store value under key, evicting the oldest entry when full."""
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.maxsize:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+    
+    def discard(self, key) -> None:
+        """Drop the entry for key if present."""
+        self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._entries.clear()
@@ -1,6 +1,5 @@
 """Command line interface for PrestaShop MCP Server."""
 
-import asyncio
 import logging
 import sys
 from typing import Optional
@@ -8,7 +7,7 @@ from typing import Optional
 import click
 
 from .config import Config
-from .prestashop_mcp_server import main as server_main
+from .prestashop_mcp_server import run as run_server
 
 
 def setup_logging(level: str):
@@ -65,7 +64,7 @@ def main(
         logger.info(f"Starting PrestaShop MCP Server for shop: {config.shop_url}")
         
         # Run server
-        asyncio.run(server_main())
+        run_server()
     
     except Exception as e:
         click.echo(f"Error: {e}", err=True)
@@ -1,14 +1,18 @@
 """Configuration management for PrestaShop MCP Server."""
 
+import functools
 import os
-from typing import Optional
+import re
+from typing import Any, Dict, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+_URL_RE = re.compile(r'^https?://')
+
 
 class Config(BaseModel):
     """Configuration for PrestaShop MCP Server."""
@@ -28,20 +32,62 @@ class Config(BaseModel):
         default_factory=lambda: os.getenv("LOG_LEVEL", "INFO")
     )
     
+    max_concurrency: int = Field(
+        description="Maximum number of concurrent PrestaShop API requests",
+        default_factory=lambda: int(os.getenv("PRESTASHOP_MAX_CONCURRENCY", "16"))
+    )
+    
+    requests_per_second: float = Field(
+        description="Maximum PrestaShop API requests started per second (0 disables throttling)",
+        default_factory=lambda: float(os.getenv("PRESTASHOP_RPS", "0"))
+    )
+    
+    http2: bool = Field(
+        description="Use HTTP/2 via httpx for API requests (requires the http2 extra)",
+        default_factory=lambda: os.getenv("PRESTASHOP_HTTP2", "").lower() in ("1", "true", "yes")
+    )
+    
+    cache_dir: Optional[str] = Field(
+        description="Directory persisting near-static shop data across restarts (requires diskcache)",
+        default_factory=lambda: os.getenv("PRESTASHOP_CACHE_DIR") or None
+    )
+    
+    _validated: bool = PrivateAttr(default=False)
+    
     def validate_config(self) -> None:
-        """Validate that required configuration is present."""
+        """Validate that required configuration is present (checked once per instance)."""
+        if self._validated:
+            return
+        
         if not self.shop_url:
             raise ValueError("PRESTASHOP_SHOP_URL environment variable is required")
         
         if not self.api_key:
             raise ValueError("PRESTASHOP_API_KEY environment variable is required")
         
-        if not self.shop_url.startswith(('http://', 'https://')):
+        if not _URL_RE.match(self.shop_url):
             raise ValueError("PRESTASHOP_SHOP_URL must start with http:// or https://")
+        
+        if self.max_concurrency < 1:
+            raise ValueError("PRESTASHOP_MAX_CONCURRENCY must be at least 1")
+        
+        if self.requests_per_second < 0:
+            raise ValueError("PRESTASHOP_RPS must not be negative")
+        
+        self._validated = True
     
     @classmethod
     def from_env(cls) -> "Config":
-        """Create configuration from environment variables."""
-        config = cls()
-        config.validate_config()
-        return config
\ No newline at end of file
+        """Create configuration from environment variables (read once per process)."""
+        config = cls(**_env_snapshot())
+        # The snapshot only holds values that already passed validation
+        config._validated = True
+        return config
+
+
+@functools.lru_cache(maxsize=1)
+def _env_snapshot() -> Dict[str, Any]:
+    """Read and validate the environment once; each from_env() gets a fresh Config."""
+    config = Config()
+    config.validate_config()
+    return config.model_dump()
\ No newline at end of file
@@ -1,32 +1,162 @@
 """PrestaShop API Client with CORRECT XML Structure per Official Documentation."""
 
 import asyncio
+import base64
+import functools
 import json
 import logging
+import random
 import re
+import time
 import xml.etree.ElementTree as ET
-from typing import Any, Dict, List, Optional
-from urllib.parse import urljoin
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 import aiohttp
-from aiohttp import BasicAuth
 
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json is used otherwise
+    orjson = None
+
+try:
+    import httpx
+except ImportError:  # optional HTTP/2 transport, aiohttp is used otherwise
+    httpx = None
+
+from .cache import MISSING, TTLCache
 from .config import Config
 
 
+# link_rewrite keeps ASCII letters, digits and whitespace; ASCII names are
+# stripped with one translate() pass, anything else goes through the regex
+_LINK_REWRITE_ASCII_DROP = str.maketrans('', '', ''.join(
+    c for c in map(chr, range(128)) if not (c.isalnum() or c.isspace())
+))
+_LINK_REWRITE_DROP_RE = re.compile(r'[^a-zA-Z0-9\s]')
+
+
+@functools.lru_cache(maxsize=1024)
+def _link_rewrite(name: str) -> str:
+    """Slug for a name; pure, so repeated names in batch imports hit the cache."""
+    # Convert to lowercase and replace spaces/special chars with hyphens
+    link_rewrite = name.lower()
+    if link_rewrite.isascii():
+        link_rewrite = link_rewrite.translate(_LINK_REWRITE_ASCII_DROP)
+    else:
+        link_rewrite = _LINK_REWRITE_DROP_RE.sub('', link_rewrite)
+    return '-'.join(link_rewrite.split())
+
+
+# Network failures surfaced as PrestaShopAPIError, for whichever transport runs
+_TRANSPORT_ERRORS = (aiohttp.ClientError,) + ((httpx.HTTPError,) if httpx else ())
+
+# Shared read-only request fragments; aiohttp copies them into each request
+_JSON_OUTPUT_PARAMS = {'output_format': 'JSON'}
+_XML_BODY_HEADERS = {'Content-Type': 'application/xml; charset=UTF-8'}
+_JSON_BODY_HEADERS = {'Content-Type': 'application/json; charset=UTF-8'}
+
+
+# PrestaShop boolean fields as sent in request bodies, indexed by bool
+_FLAG = ("0", "1")
+
+# stock_available body for a simple product in the default shop; id,
+# id_product and quantity are filled in per update
+_STOCK_AVAILABLE_TEMPLATE = {
+    "id": None,
+    "id_product": None,
+    "id_product_attribute": "0",  # 0 for simple products
+    "id_shop": "1",  # Default shop
+    "id_shop_group": "0",
+    "quantity": None,
+    "depends_on_stock": "0",
+    "out_of_stock": "2"  # Deny orders when out of stock
+}
+
+
 class PrestaShopAPIError(Exception):
     """PrestaShop API Error."""
-    pass
+    
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+def _product_stock_row(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Pick a product's own stock row (id_product_attribute 0) over its combinations'."""
+    for row in rows:
+        if str(row.get('id_product_attribute')) == '0':
+            return row
+    return rows[0]
+
+
+class RawJSON(str):
+    """JSON response text passed through undecoded, for callers that only re-serialize it."""
+
+
+class _RateLimiter:
+    """Space request starts at least 1/rate seconds apart."""
+    
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next_start = 0.0
+    
+    async def wait(self) -> None:
+        """Wait until the next request slot."""
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._next_start)
+        self._next_start = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
 
 
 class PrestaShopClient:
     """PrestaShop API Client with CORRECT XML structure per official documentation."""
     
+    # Statuses PrestaShop (or a proxy in front of it) uses for overload. A 429
+    # rejects the request before it is processed, so any method is retried; a
+    # 503 may arrive after a write was applied, so only reads retry on it
+    RETRY_STATUSES = frozenset({429})
+    READ_RETRY_STATUSES = frozenset({429, 503})
+    READ_METHODS = frozenset({'GET', 'HEAD'})
+    MAX_RETRIES = 3
+    # Upper bound in seconds on a single retry wait, whatever Retry-After says
+    MAX_RETRY_DELAY = 30
+    
+    # Near-static resources whose GETs are served from memory, with their TTL
+    # in seconds; any write to the same resource drops its cached entries
+    CACHED_RESOURCES = {'categories': 60, 'order_states': 3600, 'configurations': 60}
+    
+    # Seconds a successful connection check is trusted before re-probing
+    CONNECTION_CHECK_TTL = 10
+    
+    # Fields fetched per product when a listing is only enriched with stock
+    # or category info rather than full details
+    ENRICHMENT_DISPLAY = '[id,id_category_default,name,price]'
+    
+    # Shops without webservice PATCH answer 405/501; 400 means the partial
+    # body was refused. Either way the update falls back to GET + full PUT
+    PARTIAL_UPDATE_FALLBACK_STATUSES = frozenset({400, 405, 501})
+    
     def __init__(self, config: Config):
         self.config = config
         self.base_url = config.shop_url.rstrip('/') + '/api/'
-        self.auth = BasicAuth(config.api_key, '')
+        # The webservice key is the Basic auth user with an empty password;
+        # encoded once here and sent as a session default header
+        self.auth_header = 'Basic ' + base64.b64encode(f"{config.api_key}:".encode('latin1')).decode('ascii')
         self.session: Optional[aiohttp.ClientSession] = None
+        self._http2_client: Optional["httpx.AsyncClient"] = None
+        if config.http2 and httpx is None:
+            logging.warning("PRESTASHOP_HTTP2 is set but httpx is not installed; using HTTP/1.1")
+        # Created on first request so they belong to the running event loop
+        self._request_slots: Optional[asyncio.Semaphore] = None
+        self._rate_limiter = (
+            _RateLimiter(config.requests_per_second) if config.requests_per_second > 0 else None
+        )
+        self._partial_updates_supported = True
+        self._connection_ok_until = 0.0
+        self._get_caches = {
+            resource: TTLCache(ttl=ttl, maxsize=512) for resource, ttl in self.CACHED_RESOURCES.items()
+        }
         self.available_languages = [
             {"id": 1, "name": "Default"},
             {"id": 2, "name": "Secondary"}
@@ -36,11 +166,35 @@ class PrestaShopClient:
         """Get or create aiohttp session."""
         if self.session is None or self.session.closed:
             self.session = aiohttp.ClientSession(
-                auth=self.auth,
-                timeout=aiohttp.ClientTimeout(total=30)
+                timeout=aiohttp.ClientTimeout(total=30),
+                # Pooled keep-alive connections to the single shop host, sized
+                # to the request slots, with DNS answers cached so reused
+                # sockets skip the lookup too
+                connector=aiohttp.TCPConnector(
+                    limit=self.config.max_concurrency,
+                    limit_per_host=self.config.max_concurrency,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=30
+                ),
+                headers={'Accept': 'application/json', 'Authorization': self.auth_header}
             )
         return self.session
     
+    def _get_http2_client(self) -> Optional["httpx.AsyncClient"]:
+        """Get or create the HTTP/2 client, or None to use the aiohttp session."""
+        if self._http2_client is None and self.config.http2 and httpx is not None:
+            # One multiplexed connection carries the concurrent fan-out
+            self._http2_client = httpx.AsyncClient(
+                http2=True,
+                timeout=30,
+                limits=httpx.Limits(
+                    max_connections=self.config.max_concurrency,
+                    max_keepalive_connections=self.config.max_concurrency
+                ),
+                headers={'Accept': 'application/json', 'Authorization': self.auth_header}
+            )
+        return self._http2_client
+    
     def _dict_to_xml(self, data: Dict[str, Any], root_name: str = "prestashop") -> str:
         """Convert dictionary to XML format with CORRECT PrestaShop multilingual structure."""
         def build_element(parent: ET.Element, key: str, value: Any):
@@ -93,25 +247,60 @@ class PrestaShopClient:
         method: str, 
         endpoint: str, 
         params: Optional[Dict[str, Any]] = None,
-        data: Optional[Dict[str, Any]] = None
+        data: Optional[Dict[str, Any]] = None,
+        raw: bool = False
     ) -> Dict[str, Any]:
-        """Make HTTP request to PrestaShop API."""
-        session = await self._get_session()
-        url = urljoin(self.base_url, endpoint)
+        """Make HTTP request to PrestaShop API, caching GETs of near-static resources.
         
-        # Always request JSON format for responses
-        if params is None:
-            params = {}
-        params['output_format'] = 'JSON'
+        With raw=True a JSON body is returned as RawJSON text instead of being decoded.
+        """
+        cache = self._get_caches.get(endpoint.split('/', 1)[0])
+        if cache is None:
+            return await self._send_request(method, endpoint, params, data, raw)
+        
+        if method != 'GET':
+            try:
+                return await self._send_request(method, endpoint, params, data, raw)
+            finally:
+                cache.clear()
+        
+        key = (endpoint, tuple(sorted(params.items())) if params else (), raw)
+        task = cache.get(key)
+        if task is MISSING:
+            # The task itself is cached so concurrent identical GETs share it
+            task = asyncio.ensure_future(self._send_request(method, endpoint, params, data, raw))
+            cache.set(key, task)
+            task.add_done_callback(
+                lambda done: cache.discard(key)
+                if (done.cancelled() or done.exception()) and cache.get(key) is done
+                else None
+            )
+        # Shielded so one caller being cancelled does not cancel the shared GET
+        return await asyncio.shield(task)
+    
+    async def _send_request(
+        self, 
+        method: str, 
+        endpoint: str, 
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        raw: bool = False
+    ) -> Dict[str, Any]:
+        """Send HTTP request to PrestaShop API."""
+        # Endpoints are always relative to the /api/ root built once in __init__
+        url = self.base_url + endpoint
+        
+        # Always request JSON format for responses, leaving the caller's dict untouched
+        params = {**params, 'output_format': 'JSON'} if params else _JSON_OUTPUT_PARAMS
         
         # Prepare request body and headers
         request_body = None
-        headers = {}
+        headers = None
         
-        if data and method.upper() in ['POST', 'PUT']:
+        if data and method.upper() in ['POST', 'PUT', 'PATCH']:
             # Convert data to XML for write operations
             request_body = self._dict_to_xml(data)
-            headers['Content-Type'] = 'application/xml; charset=UTF-8'
+            headers = _XML_BODY_HEADERS
             
             # Debug logging for XML structure
             logging.info(f"=== XML Request for {method} {endpoint} ===")
@@ -121,41 +310,122 @@ class PrestaShopClient:
         elif data:
             # For other methods, use JSON (though this should be rare)
             request_body = json.dumps(data)
-            headers['Content-Type'] = 'application/json; charset=UTF-8'
+            headers = _JSON_BODY_HEADERS
+        
+        if self._request_slots is None:
+            self._request_slots = asyncio.Semaphore(self.config.max_concurrency)
+        
+        retry_statuses = (
+            self.READ_RETRY_STATUSES if method.upper() in self.READ_METHODS
+            else self.RETRY_STATUSES
+        )
         
         try:
-            async with session.request(
-                method=method,
-                url=url,
-                params=params,
-                data=request_body,
-                headers=headers if headers else None
-            ) as response:
-                if response.status >= 400:
-                    error_text = await response.text()
+            for attempt in range(self.MAX_RETRIES + 1):
+                if self._rate_limiter is not None:
+                    await self._rate_limiter.wait()
+                
+                async with self._request_slots:
+                    status, response_headers, body = await self._transfer(
+                        method, url, params, request_body, headers
+                    )
+                
+                if status in retry_statuses and attempt < self.MAX_RETRIES:
+                    # Back off outside the concurrency slot so other requests proceed
+                    retry_delay = self._retry_delay(response_headers, attempt)
+                    logging.warning(
+                        f"{method} {endpoint} returned {status}, retrying in {retry_delay:.1f}s"
+                    )
+                    await asyncio.sleep(retry_delay)
+                    continue
+                
+                if status >= 400:
+                    error_text = body.decode('utf-8', 'replace')
                     raise PrestaShopAPIError(
-                        f"API request failed with status {response.status}: {error_text}"
+                        f"API request failed with status {status}: {error_text}",
+                        status=status
                     )
                 
-                response_text = await response.text()
-                if not response_text:
+                if not body:
                     return {}
                 
+                if raw and body[:1] in (b'{', b'['):
+                    return RawJSON(body.decode('utf-8'))
+                
+                # Both parsers accept the raw bytes, skipping a str decode
                 try:
-                    return json.loads(response_text)
-                except json.JSONDecodeError:
+                    return orjson.loads(body) if orjson else json.loads(body)
+                except ValueError:
+                    response_text = body.decode('utf-8', 'replace')
                     logging.warning(f"Non-JSON response: {response_text}")
                     return {"raw_response": response_text}
         
-        except aiohttp.ClientError as e:
+        except _TRANSPORT_ERRORS as e:
             raise PrestaShopAPIError(f"HTTP client error: {str(e)}")
+    
+    async def _transfer(
+        self,
+        method: str,
+        url: str,
+        params: Dict[str, Any],
+        body: Optional[str],
+        headers: Optional[Dict[str, str]]
+    ) -> Tuple[int, Mapping[str, str], bytes]:
+        """Perform one HTTP exchange, returning status, headers and raw body."""
+        http2_client = self._get_http2_client()
+        if http2_client is not None:
+            response = await http2_client.request(
+                method, url, params=params, content=body, headers=headers
+            )
+            return response.status_code, response.headers, response.content
+        
+        session = await self._get_session()
+        async with session.request(
+            method=method,
+            url=url,
+            params=params,
+            data=body,
+            headers=headers
+        ) as response:
+            return response.status, response.headers, await response.read()
+    
+    @classmethod
+    def _retry_delay(cls, headers: Mapping[str, str], attempt: int) -> float:
+        """Delay before retrying an overloaded request, honouring a capped Retry-After."""
+        retry_after = headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return min(float(retry_after), cls.MAX_RETRY_DELAY)
+        # Exponential backoff with jitter so parallel retries spread out
+        return 2 ** attempt + random.random()
 
+    async def _partial_update(
+        self,
+        resource: str,
+        entity: str,
+        entity_id: str,
+        changes: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """PATCH only the changed fields, or return None if the shop refuses it."""
+        if not self._partial_updates_supported:
+            return None
+        
+        try:
+            return await self._make_request(
+                'PATCH',
+                f'{resource}/{entity_id}',
+                data={entity: {"id": str(entity_id), **changes}}
+            )
+        except PrestaShopAPIError as e:
+            if e.status in (405, 501):
+                # Not supported by this shop; skip the attempt from now on
+                self._partial_updates_supported = False
+            if e.status in self.PARTIAL_UPDATE_FALLBACK_STATUSES:
+                return None
+            raise
+    
     def _generate_link_rewrite(self, name: str) -> str:
         """Generate URL-friendly link rewrite from name."""
-        # Convert to lowercase and replace spaces/special chars with hyphens
-        link_rewrite = re.sub(r'[^a-zA-Z0-9\s]', '', name.lower())
-        link_rewrite = re.sub(r'\s+', '-', link_rewrite.strip())
-        return link_rewrite
+        return _link_rewrite(name)
 
     # ============================================================================
     # UNIFIED PRODUCT MANAGEMENT
@@ -169,7 +439,8 @@ class PrestaShopClient:
         include_details: bool = False,
         include_stock: bool = False,
         include_category_info: bool = False,
-        display: Optional[str] = None
+        display: Optional[str] = None,
+        raw: bool = False
     ) -> Dict[str, Any]:
         """
         Unified product retrieval method supporting all use cases.
@@ -182,6 +453,7 @@ class PrestaShopClient:
             include_stock: Include stock/inventory information
             include_category_info: Include category details
             display: Comma-separated list of specific fields to include
+            raw: Return an unenriched product list as undecoded RawJSON text
             
         Returns:
             Single product data (if product_id provided) or list of products
@@ -204,7 +476,8 @@ class PrestaShopClient:
             include_details=include_details,
             include_stock=include_stock,
             include_category_info=include_category_info,
-            display=display
+            display=display,
+            raw=raw
         )
     
     async def _get_single_product(
@@ -227,42 +500,22 @@ class PrestaShopClient:
             if 'product' not in product_data:
                 raise PrestaShopAPIError(f"Product {product_id} not found")
             
-            result = product_data.copy()
+            # The parsed response is ours alone, so it is enriched in place
+            result = product_data
             
             # Add enhanced information if requested
             if include_details:
                 # Details are already included in the main product data
                 pass
             
+            # Stock and category lookups are independent, so they overlap
+            lookups = {}
             if include_stock:
-                try:
-                    stock_params = {'filter[id_product]': product_id}
-                    stock_response = await self._make_request('GET', 'stock_availables', params=stock_params)
-                    
-                    if 'stock_availables' in stock_response and stock_response['stock_availables']:
-                        result['stock_info'] = stock_response['stock_availables'][0]
-                    else:
-                        result['stock_info'] = {"error": "Stock information not available"}
-                        
-                except Exception as e:
-                    logging.warning(f"Could not retrieve stock info for product {product_id}: {e}")
-                    result['stock_info'] = {"error": f"Stock retrieval failed: {str(e)}"}
-            
+                lookups['stock_info'] = self._get_stock_info(product_id)
             if include_category_info:
-                try:
-                    category_id = product_data['product'].get('id_category_default')
-                    if category_id:
-                        category_response = await self._make_request('GET', f'categories/{category_id}')
-                        if 'category' in category_response:
-                            result['category_info'] = category_response['category']
-                        else:
-                            result['category_info'] = {"error": "Category not found"}
-                    else:
-                        result['category_info'] = {"error": "No default category assigned"}
-                        
-                except Exception as e:
-                    logging.warning(f"Could not retrieve category info for product {product_id}: {e}")
-                    result['category_info'] = {"error": f"Category retrieval failed: {str(e)}"}
+                lookups['category_info'] = self._get_category_info(product_id, product_data['product'])
+            if lookups:
+                result.update(zip(lookups, await asyncio.gather(*lookups.values())))
             
             return result
             
@@ -271,6 +524,56 @@ class PrestaShopClient:
         except Exception as e:
             raise PrestaShopAPIError(f"Failed to retrieve product: {str(e)}")
     
+    async def _get_stock_info(self, product_id: str) -> Dict[str, Any]:
+        """Get the stock entry of a product, or an error dict."""
+        try:
+            stock_response = await self.get_product_stock_availables(product_id)
+            
+            if 'stock_availables' in stock_response and stock_response['stock_availables']:
+                return _product_stock_row(stock_response['stock_availables'])
+            return {"error": "Stock information not available"}
+                
+        except Exception as e:
+            logging.warning(f"Could not retrieve stock info for product {product_id}: {e}")
+            return {"error": f"Stock retrieval failed: {str(e)}"}
+    
+    async def _get_stock_infos(self, product_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get the stock entries of several products in one request, keyed by product id."""
+        params = {'filter[id_product]': f"[{'|'.join(product_ids)}]", 'display': 'full'}
+        try:
+            stock_response = await self._make_request('GET', 'stock_availables', params=params)
+        except Exception as e:
+            logging.warning(f"Could not retrieve stock info for products {product_ids}: {e}")
+            failure = {"error": f"Stock retrieval failed: {str(e)}"}
+            return dict.fromkeys(product_ids, failure)
+        
+        # Empty results come back as a bare list; combinations have rows of
+        # their own, so each product's row is picked as in the single lookup
+        rows_by_product = {}
+        if isinstance(stock_response, dict):
+            for entry in stock_response.get('stock_availables', []):
+                rows_by_product.setdefault(str(entry.get('id_product')), []).append(entry)
+        return {
+            product_id: _product_stock_row(rows)
+            for product_id, rows in rows_by_product.items()
+        }
+    
+    async def _get_category_info(self, product_id: str, product: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the default category of a product, or an error dict."""
+        try:
+            category_id = product.get('id_category_default')
+            if not category_id:
+                return {"error": "No default category assigned"}
+            
+            category_response = await self._make_request('GET', f'categories/{category_id}')
+            if 'category' in category_response:
+                return category_response['category']
+            return {"error": "Category not found"}
+                
+        except Exception as e:
+            logging.warning(f"Could not retrieve category info for product {product_id}: {e}")
+            return {"error": f"Category retrieval failed: {str(e)}"}
+    
     async def _get_multiple_products(
         self,
         limit: int = 10,
@@ -278,7 +581,8 @@ class PrestaShopClient:
         include_details: bool = False,
         include_stock: bool = False,
         include_category_info: bool = False,
-        display: Optional[str] = None
+        display: Optional[str] = None,
+        raw: bool = False
     ) -> Dict[str, Any]:
         """Get multiple products with optional enhanced information."""
         params = {'limit': limit}
@@ -294,34 +598,90 @@ class PrestaShopClient:
             if 'category' in filters:
                 params['filter[id_category_default]'] = filters['category']
         
-        products_data = await self._make_request('GET', 'products', params=params)
+        enhanced = include_details or include_stock or include_category_info
+        # Only a listing returned as-is can skip decoding
+        products_data = await self._make_request(
+            'GET', 'products', params=params, raw=raw and not enhanced
+        )
         
         # If enhanced information is requested, fetch it for each product
-        if (include_details or include_stock or include_category_info) and 'products' in products_data:
-            enhanced_products = []
+        if enhanced and 'products' in products_data:
+            # Stock/category enrichment alone does not need the full resource
+            detail_display = display
+            if not include_details and not display:
+                detail_display = self.ENRICHMENT_DISPLAY
+            
+            # Stock for the whole page comes from one IN-filtered request that
+            # runs alongside the per-product fetches
+            stock_lookup = None
+            if include_stock:
+                product_ids = [str(p['id']) for p in products_data['products'] if p.get('id')]
+                if product_ids:
+                    stock_lookup = asyncio.ensure_future(self._get_stock_infos(product_ids))
             
-            for product in products_data['products']:
+            async def enhance(product: Dict[str, Any]) -> Dict[str, Any]:
                 product_id = product.get('id')
-                if product_id:
-                    try:
-                        enhanced_product = await self._get_single_product(
-                            product_id=product_id,
-                            include_details=include_details,
-                            include_stock=include_stock,
-                            include_category_info=include_category_info,
-                            display=display
-                        )
-                        enhanced_products.append(enhanced_product)
-                    except Exception as e:
-                        logging.warning(f"Could not enhance product {product_id}: {e}")
-                        enhanced_products.append(product)
-                else:
-                    enhanced_products.append(product)
+                if not product_id:
+                    return product
+                try:
+                    result = await self._get_single_product(
+                        product_id=product_id,
+                        include_details=include_details,
+                        display=detail_display
+                    )
+                except Exception as e:
+                    logging.warning(f"Could not enhance product {product_id}: {e}")
+                    return product
+                if stock_lookup is not None:
+                    result['stock_info'] = (await stock_lookup).get(
+                        str(product_id), {"error": "Stock information not available"}
+                    )
+                return result
             
-            products_data['products'] = enhanced_products
+            # Per-product lookups are independent, so they run concurrently
+            # over the pooled session instead of one round trip at a time
+            products_data['products'] = list(await asyncio.gather(
+                *(enhance(product) for product in products_data['products'])
+            ))
+            
+            if include_category_info:
+                await self._add_category_infos(products_data['products'])
         
         return products_data
     
+    async def _add_category_infos(self, products: List[Dict[str, Any]]) -> None:
+        """Attach category_info to fetched products using one IN-filtered request."""
+        fetched = [p for p in products if 'product' in p]
+        # Sorted so the same page always maps to the same cached request
+        category_ids = sorted({
+            str(p['product']['id_category_default'])
+            for p in fetched if p['product'].get('id_category_default')
+        })
+        
+        category_map = {}
+        failure = None
+        if category_ids:
+            params = {'filter[id]': f"[{'|'.join(category_ids)}]", 'display': 'full'}
+            try:
+                category_response = await self._make_request('GET', 'categories', params=params)
+                # Empty results come back as a bare list
+                if isinstance(category_response, dict):
+                    category_map = {
+                        str(c.get('id')): c for c in category_response.get('categories', [])
+                    }
+            except Exception as e:
+                logging.warning(f"Could not retrieve categories {category_ids}: {e}")
+                failure = {"error": f"Category retrieval failed: {str(e)}"}
+        
+        for product in fetched:
+            category_id = product['product'].get('id_category_default')
+            if not category_id:
+                product['category_info'] = {"error": "No default category assigned"}
+            else:
+                product['category_info'] = failure or category_map.get(
+                    str(category_id), {"error": "Category not found"}
+                )
+    
     async def create_product(
         self,
         name: str,
@@ -422,27 +782,33 @@ class PrestaShopClient:
         **kwargs
     ) -> Dict[str, Any]:
         """Update an existing product in PrestaShop."""
-        # First get the existing product
-        existing = await self._make_request('GET', f'products/{product_id}')
-        
-        if 'product' not in existing:
-            raise PrestaShopAPIError(f"Product {product_id} not found")
-        
-        product_data = existing['product']
-        
-        # Update fields with correct multilingual structure
+        # Collect changed fields with correct multilingual structure
+        changes = {}
         if 'name' in kwargs:
-            product_data['name'] = self._init_multilingual_field(kwargs['name'])
+            changes['name'] = self._init_multilingual_field(kwargs['name'])
             link_rewrite = self._generate_link_rewrite(kwargs['name'])
-            product_data['link_rewrite'] = self._init_multilingual_field(link_rewrite)
+            changes['link_rewrite'] = self._init_multilingual_field(link_rewrite)
         if 'price' in kwargs:
-            product_data['price'] = str(kwargs['price'])
+            changes['price'] = str(kwargs['price'])
         if 'description' in kwargs:
-            product_data['description'] = self._init_multilingual_field(kwargs['description'])
+            changes['description'] = self._init_multilingual_field(kwargs['description'])
         if 'category_id' in kwargs:
-            product_data['id_category_default'] = kwargs['category_id']
+            changes['id_category_default'] = kwargs['category_id']
         if 'active' in kwargs:
-            product_data['active'] = "1" if kwargs['active'] else "0"
+            changes['active'] = _FLAG[bool(kwargs['active'])]
+        
+        result = await self._partial_update('products', 'product', product_id, changes)
+        if result is not None:
+            return result
+        
+        # Fall back to merging the changes into the full existing product
+        existing = await self._make_request('GET', f'products/{product_id}')
+        
+        if 'product' not in existing:
+            raise PrestaShopAPIError(f"Product {product_id} not found")
+        
+        product_data = existing['product']
+        product_data.update(changes)
         
         return await self._make_request(
             'PUT', 
@@ -454,31 +820,40 @@ class PrestaShopClient:
         """Delete a product from PrestaShop."""
         return await self._make_request('DELETE', f'products/{product_id}')
     
+    async def get_product_stock_availables(self, product_id: str) -> Dict[str, Any]:
+        """Get the stock_availables rows of a product, with combination rows."""
+        # Full rows carry id_product_attribute, which tells the product's own
+        # row apart from its combinations'
+        stock_params = {'filter[id_product]': product_id, 'display': 'full'}
+        return await self._make_request('GET', 'stock_availables', params=stock_params)
+    
     async def update_product_stock(
         self, 
         product_id: str, 
-        quantity: int
+        quantity: int,
+        stock_response: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
-        """Update product stock quantity with CORRECT XML structure."""
+        """Update product stock quantity with CORRECT XML structure.
+        
+        Callers that know the product ahead of time can fetch
+        get_product_stock_availables() concurrently with other work and pass
+        the result as stock_response to skip the lookup round trip.
+        """
         # Get stock availables for this product
-        stock_params = {'filter[id_product]': product_id}
-        stock_response = await self._make_request('GET', 'stock_availables', params=stock_params)
+        if stock_response is None:
+            stock_response = await self.get_product_stock_availables(product_id)
         
         if 'stock_availables' in stock_response and stock_response['stock_availables']:
-            stock_entry = stock_response['stock_availables'][0]
+            stock_entry = _product_stock_row(stock_response['stock_availables'])
             stock_id = stock_entry['id']
             
             # CRITICAL FIX: Proper XML structure for stock_available
             stock_data = {
                 "stock_available": {
+                    **_STOCK_AVAILABLE_TEMPLATE,
                     "id": str(stock_id),
                     "id_product": str(product_id),
-                    "id_product_attribute": "0",  # 0 for simple products
-                    "id_shop": "1",  # Default shop
-                    "id_shop_group": "0",
-                    "quantity": str(quantity),
-                    "depends_on_stock": "0",
-                    "out_of_stock": "2"  # Deny orders when out of stock
+                    "quantity": str(quantity)
                 }
             }
             
@@ -540,7 +915,7 @@ class PrestaShopClient:
                 ),
                 "meta_keywords": self._init_multilingual_field(""),
                 "id_parent": parent_id,
-                "active": "1" if active else "0",
+                "active": _FLAG[bool(active)],
                 "is_root_category": "0",
                 "position": "0",
                 "date_add": "",
@@ -556,8 +931,26 @@ class PrestaShopClient:
         **kwargs
     ) -> Dict[str, Any]:
         """Update an existing category in PrestaShop."""
-        # First get the existing category
-        existing = await self._make_request('GET', f'categories/{category_id}')
+        # Collect changed fields with correct multilingual structure
+        changes = {}
+        if 'name' in kwargs:
+            changes['name'] = self._init_multilingual_field(kwargs['name'])
+            link_rewrite = self._generate_link_rewrite(kwargs['name'])
+            changes['link_rewrite'] = self._init_multilingual_field(link_rewrite)
+        
+        if 'description' in kwargs:
+            changes['description'] = self._init_multilingual_field(kwargs['description'])
+        
+        if 'active' in kwargs:
+            changes['active'] = _FLAG[bool(kwargs['active'])]
+        
+        result = await self._partial_update('categories', 'category', category_id, changes)
+        if result is not None:
+            return result
+        
+        # Fall back to merging the changes into the existing category, read
+        # past the GET cache so the PUT cannot write back a stale snapshot
+        existing = await self._send_request('GET', f'categories/{category_id}')
         
         if 'category' not in existing:
             raise PrestaShopAPIError(f"Category {category_id} not found")
@@ -571,18 +964,7 @@ class PrestaShopClient:
             "link_rewrite": existing['category'].get('link_rewrite', []),
             "description": existing['category'].get('description', [])
         }
-        
-        # Update only the requested fields with correct multilingual structure
-        if 'name' in kwargs:
-            category_data['name'] = self._init_multilingual_field(kwargs['name'])
-            link_rewrite = self._generate_link_rewrite(kwargs['name'])
-            category_data['link_rewrite'] = self._init_multilingual_field(link_rewrite)
-        
-        if 'description' in kwargs:
-            category_data['description'] = self._init_multilingual_field(kwargs['description'])
-        
-        if 'active' in kwargs:
-            category_data['active'] = "1" if kwargs['active'] else "0"
+        category_data.update(changes)
         
         return await self._make_request(
             'PUT', 
@@ -601,15 +983,16 @@ class PrestaShopClient:
     async def get_customers(
         self, 
         limit: int = 10, 
-        email: Optional[str] = None
+        email: Optional[str] = None,
+        raw: bool = False
     ) -> Dict[str, Any]:
-        """Get customers from PrestaShop."""
+        """Get customers from PrestaShop (as RawJSON text with raw=True)."""
         params = {'limit': limit}
         
         if email:
             params['filter[email]'] = f"[{email}]%"
         
-        return await self._make_request('GET', 'customers', params=params)
+        return await self._make_request('GET', 'customers', params=params, raw=raw)
     
     async def create_customer(
         self,
@@ -626,7 +1009,7 @@ class PrestaShopClient:
                 "firstname": firstname,
                 "lastname": lastname,
                 "passwd": password,
-                "active": "1" if active else "0",
+                "active": _FLAG[bool(active)],
                 "id_default_group": "3"  # Default customer group
             }
         }
@@ -667,7 +1050,7 @@ class PrestaShopClient:
         if 'lastname' in kwargs:
             customer_data['lastname'] = kwargs['lastname']
         if 'active' in kwargs:
-            customer_data['active'] = "1" if kwargs['active'] else "0"
+            customer_data['active'] = _FLAG[bool(kwargs['active'])]
         
         return await self._make_request(
             'PUT', 
@@ -683,9 +1066,10 @@ class PrestaShopClient:
         self, 
         limit: int = 10, 
         customer_id: Optional[str] = None,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        raw: bool = False
     ) -> Dict[str, Any]:
-        """Get orders from PrestaShop."""
+        """Get orders from PrestaShop (as RawJSON text with raw=True)."""
         params = {'limit': limit}
         
         if customer_id:
@@ -693,7 +1077,7 @@ class PrestaShopClient:
         if status:
             params['filter[current_state]'] = status
         
-        return await self._make_request('GET', 'orders', params=params)
+        return await self._make_request('GET', 'orders', params=params, raw=raw)
     
     async def update_order_status(
         self, 
@@ -790,7 +1174,7 @@ class PrestaShopClient:
             
             # Update module status
             module_data = module_info['module'].copy()
-            module_data['active'] = "1" if active else "0"
+            module_data['active'] = _FLAG[bool(active)]
             
             return await self._make_request(
                 'PUT', 
@@ -819,10 +1203,12 @@ class PrestaShopClient:
                     # Enhanced filtering with regex pattern matching
                     if config_name.startswith('PS_MAINMENU_CONTENT_'):
                         try:
-                            # Parse JSON value to make it more readable
+                            # Parse JSON value to make it more readable; the
+                            # response is shared through the GET cache, so the
+                            # parsed value goes on a copy
                             if config.get('value'):
                                 parsed_value = json.loads(config['value'])
-                                config['parsed_value'] = parsed_value
+                                config = {**config, 'parsed_value': parsed_value}
                         except json.JSONDecodeError:
                             # Keep original value if not valid JSON
                             pass
@@ -889,7 +1275,6 @@ class PrestaShopClient:
         """Add a new main menu link."""
         try:
             # Generate unique ID for the link
-            import time
             link_id = str(int(time.time()))
             config_name = f"PS_MAINMENU_CONTENT_{link_id}"
             
@@ -1150,6 +1535,9 @@ class PrestaShopClient:
     
     async def clear_cache(self, cache_type: str = "all") -> Dict[str, Any]:
         """Clear PrestaShop cache."""
+        for cache in self._get_caches.values():
+            cache.clear()
+        
         try:
             # PrestaShop doesn't have a direct API endpoint for cache clearing
             # We simulate this by updating a cache-related configuration
@@ -1335,6 +1723,14 @@ class PrestaShopClient:
     # CONFIGURATION AND UTILITY
     # ============================================================================
     
+    async def check_connection(self) -> None:
+        """Check the webservice accepts our key, raising PrestaShopAPIError if not."""
+        if time.monotonic() < self._connection_ok_until:
+            return
+        # HEAD on the API root: authenticated, but no body to download or parse
+        await self._make_request('HEAD', '')
+        self._connection_ok_until = time.monotonic() + self.CONNECTION_CHECK_TTL
+    
     async def get_configurations(
         self, 
         filter_name: Optional[str] = None
@@ -1398,6 +1794,9 @@ class PrestaShopClient:
         """Close the HTTP session."""
         if self.session and not self.session.closed:
             await self.session.close()
+        if self._http2_client is not None:
+            await self._http2_client.aclose()
+            self._http2_client = None
     
     async def __aenter__(self):
         return self
@@ -1,738 +1,1052 @@
 """Professional PrestaShop MCP Server with comprehensive CRUD operations and extended functionality."""
 
 import asyncio
+import base64
+import hashlib
+import inspect
 import json
 import sys
 import os
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "performance" extra
+    orjson = None
+
+try:
+    import fastjsonschema
+except ImportError:  # optional speedup, see the "performance" extra
+    fastjsonschema = None
+
+try:
+    import msgpack
+except ImportError:  # optional speedup, see the "performance" extra
+    msgpack = None
+
+try:
+    import uvloop
+except ImportError:  # optional speedup, not available on Windows
+    uvloop = None
+
+try:
+    import diskcache
+except ImportError:  # optional persistent cache, see the "performance" extra
+    diskcache = None
 
 # Import MCP components
 from mcp.server.models import InitializationOptions
 from mcp.server import NotificationOptions, Server
 from mcp.server.stdio import stdio_server
-from mcp.types import Tool, TextContent
+from mcp.types import BlobResourceContents, EmbeddedResource, Tool, TextContent
 
 # Import our PrestaShop components
+from .cache import MISSING, TTLCache
 from .config import Config
-from .prestashop_client import PrestaShopClient, PrestaShopAPIError
+from .prestashop_client import PrestaShopClient, PrestaShopAPIError, RawJSON
+
 
+SERVER_NAME = "prestashop-mcp"
+SERVER_VERSION = "4.0.0"
 
 # Create server instance
-server = Server("prestashop-mcp")
+server = Server(SERVER_NAME)
+
+# Shared client reused by every tool call so the HTTP session and its pooled
+# keep-alive connections survive between requests; opened and closed by main()
+_client: Optional[PrestaShopClient] = None
+
+
+def _get_client() -> PrestaShopClient:
+    """Return the shared PrestaShop client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = PrestaShopClient(Config())
+    return _client
+
+
+# Tool results are compact JSON; MCP_PRETTY=1 indents them for debugging
+_PRETTY = os.getenv("MCP_PRETTY", "").lower() in ("1", "true", "yes")
+
+# json.dumps(..., indent=2) builds a new JSONEncoder on every call; the
+# stdlib fallback reuses a single one
+_RESULT_ENCODER = (
+    json.JSONEncoder(indent=2) if _PRETTY else json.JSONEncoder(separators=(',', ':'))
+)
+
+
+def _error_template(prefix: str, error_type: str) -> str:
+    """Encode an error payload once, leaving a %s slot for the message."""
+    return _RESULT_ENCODER.encode({"error": f"{prefix}: %s", "type": error_type})
+
+
+# Error payloads only differ in their message, so the surrounding JSON is
+# built once in the same layout as the results
+_API_ERROR_TEMPLATE = _error_template("PrestaShop API Error", "api_error")
+_INTERNAL_ERROR_TEMPLATE = _error_template("Tool execution failed", "internal_error")
+_VALIDATION_ERROR_TEMPLATE = _error_template("Invalid arguments", "validation_error")
+
+
+def _error_text(template: str, error) -> str:
+    """Render an error template with the JSON-escaped error message."""
+    return template % json.dumps(str(error))[1:-1]
+
+
+_ORJSON_OPTIONS = orjson.OPT_INDENT_2 if orjson is not None and _PRETTY else 0
+
+
+def _encode_result(result) -> str:
+    """Serialize a tool result for the TextContent payload."""
+    if isinstance(result, RawJSON):
+        # Upstream JSON text is already compact enough to emit unchanged
+        if not _PRETTY:
+            return result
+        result = json.loads(result)
+    if orjson is not None:
+        try:
+            # Compact output: indentation only adds bytes to the stdio payload
+            return orjson.dumps(result, option=_ORJSON_OPTIONS).decode()
+        except TypeError:
+            # e.g. non-string keys or out-of-range integers, which the
+            # stdlib encoder still handles
+            pass
+    return _RESULT_ENCODER.encode(result)
+
+
+# Experimental capability a client sets during initialization to receive
+# tool results as MessagePack instead of JSON text
+_MSGPACK_CAPABILITY = "prestashop/msgpack"
+
+
+def _client_accepts_msgpack() -> bool:
+    """Whether the client of the current request negotiated MessagePack results."""
+    if msgpack is None:
+        return False
+    try:
+        client_params = server.request_context.session.client_params
+    except (LookupError, AttributeError):
+        return False
+    experimental = client_params.capabilities.experimental if client_params else None
+    return bool(experimental) and _MSGPACK_CAPABILITY in experimental
+
+
+def _msgpack_content(name: str, result) -> EmbeddedResource:
+    """Wrap a MessagePack-encoded tool result as an embedded binary resource."""
+    if isinstance(result, RawJSON):
+        result = json.loads(result)
+    # MCP carries binary payloads base64-encoded inside blob resources
+    blob = base64.b64encode(msgpack.packb(result, use_bin_type=True)).decode('ascii')
+    return EmbeddedResource(
+        type="resource",
+        resource=BlobResourceContents(
+            uri=f"prestashop://tool-result/{name}",
+            mimeType="application/msgpack",
+            blob=blob
+        )
+    )
+
+
+# Schema of the tools that take no arguments
+_EMPTY_SCHEMA = {"type": "object", "properties": {}, "additionalProperties": False}
+
+# Property definitions shared verbatim by several tool schemas, grouped by
+# domain; tools reference the same dict objects instead of repeating them
+_DEFS = {
+    # Products
+    "product_id": {"type": "string", "description": "Product ID"},
+    # Modules
+    "module_name": {"type": "string", "description": "Module technical name"},
+    # Main menu
+    "link_name": {"type": "string", "description": "Link display name"},
+    "link_url": {"type": "string", "description": "Link URL"},
+}
+
+
+# Tool definitions are static, so they are built once at import time and
+# every list_tools request returns the same objects
+_TOOLS = [
+    # Connection & Info
+    Tool(
+        name="test_connection",
+        description="Test PrestaShop API connection",
+        inputSchema=_EMPTY_SCHEMA
+    ),
+    Tool(
+        name="get_shop_info",
+        description="Get general shop information and statistics",
+        inputSchema=_EMPTY_SCHEMA
+    ),
+    
+    # Categories CRUD
+    Tool(
+        name="get_categories",
+        description="Get PrestaShop categories",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "limit": {"type": "integer", "description": "Number of categories to retrieve", "default": 10},
+                "parent_id": {"type": "string", "description": "Filter by parent category ID"}
+            },
+            "additionalProperties": False
+        }
+    ),
+    Tool(
+        name="create_category",
+        description="Create a new category",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "name": {"type": "string", "description": "Category name"},
+                "description": {"type": "string", "description": "Category description"},
+                "parent_id": {"type": "string", "description": "Parent category ID", "default": "2"},
+                "active": {"type": "boolean", "description": "Whether category is active", "default": True}
+            },
+            "required": ["name"],
+            "additionalProperties": False
+        }
+    ),
+    Tool(
+        name="update_category",
+        description="Update an existing category",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "category_id": {"type": "string", "description": "Category ID to update"},
+                "name": {"type": "string", "description": "New category name"},
+                "description": {"type": "string", "description": "New category description"},
+                "active": {"type": "boolean", "description": "Whether category is active"}
+            },
+            "required": ["category_id"],
+            "additionalProperties": False
+        }
+    ),
+    Tool(
+        name="delete_category",
+        description="Delete a category",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "category_id": {"type": "string", "description": "Category ID to delete"}
+            },
+            "required": ["category_id"],
+            "additionalProperties": False
+        }
+    ),
+    
+    # Unified Products Management
+    Tool(
+        name="get_products",
+        description="Unified product retrieval - supports both single product by ID and multiple products with comprehensive filtering and enhancement options",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "product_id": {"type": "string", "description": "Retrieve single product by ID (takes precedence over other params)"},
+                "limit": {"type": "integer", "description": "Number of products to retrieve for list queries", "default": 10},
+                "category_id": {"type": "string", "description": "Filter by category ID"},
+                "name_filter": {"type": "string", "description": "Filter by product name"},
+                "include_details": {"type": "boolean", "description": "Include complete product information", "default": False},
+                "include_stock": {"type": "boolean", "description": "Include stock/inventory information", "default": False},
+                "include_category_info": {"type": "boolean", "description": "Include category details", "default": False},
+                "display": {"type": "string", "description": "Comma-separated list of specific fields to include (e.g., 'id,name,price')"}
+            },
+            "additionalProperties": False
+        }
+    ),
+    Tool(
+        name="create_product",
+        description="Create a new product",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "name": {"type": "string", "description": "Product name"},
+                "price": {"type": "number", "description": "Product price"},
+                "description": {"type": "string", "description": "Product description"},
+                "category_id": {"type": "string", "description": "Category ID"},
+                "quantity": {"type": "integer", "description": "Initial stock quantity"},
+                "reference": {"type": "string", "description": "Product reference/SKU"},
+                "weight": {"type": "number", "description": "Product weight"}
+            },
+            "required": ["name", "price"],
+            "additionalProperties": False
+        }
+    ),
+    Tool(
+        name="update_product",
+        description="Update an existing product",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "product_id": {"type": "string", "description": "Product ID to update"},
+                "name": {"type": "string", "description": "New product name"},
+                "price": {"type": "number", "description": "New product price"},
+                "description": {"type": "string", "description": "New product description"},
+                "category_id": {"type": "string", "description": "New category ID"},
+                "active": {"type": "boolean", "description": "Whether product is active"}
+            },
+            "required": ["product_id"],
+            "additionalProperties": False
+        }
+    ),
+    Tool(
+        name="delete_product",
+        description="Delete a product",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "product_id": {"type": "string", "description": "Product ID to delete"}
+            },
+            "required": ["product_id"],
+            "additionalProperties": False
+        }
+    ),
+    Tool(
+        name="update_product_stock",
+        description="Update product stock quantity",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "product_id": _DEFS["product_id"],
+                "quantity": {"type": "integer", "description": "New stock quantity"}
+            },
+            "required": ["product_id", "quantity"],
+            "additionalProperties": False
+        }
+    ),
+    Tool(
+        name="update_product_price",
+        description="Update product price",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "product_id": _DEFS["product_id"],
+                "price": {"type": "number", "description": "New price"},
+                "wholesale_price": {"type": "number", "description": "New wholesale price"}
+            },
+            "required": ["product_id", "price"],
+            "additionalProperties": False
+        }
+    ),
+    
+    # Customers CRUD
+    Tool(
+        name="get_customers",
+        description="Get PrestaShop customers",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "limit": {"type": "integer", "description": "Number of customers to retrieve", "default": 10},
+                "email_filter": {"type": "string", "description": "Filter by email"}
+            },
+            "additionalProperties": False
+        }
+    ),
+    Tool(
+        name="create_customer",
+        description="Create a new customer",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "email": {"type": "string", "description": "Customer email"},
+                "firstname": {"type": "string", "description": "First name"},
+                "lastname": {"type": "string", "description": "Last name"},
+                "password": {"type": "string", "description": "Customer password"},
+                "active": {"type": "boolean", "description": "Whether customer is active", "default": True}
+            },
+            "required": ["email", "firstname", "lastname", "password"],
+            "additionalProperties": False
+        }
+    ),
+    Tool(
+        name="update_customer",
+        description="Update an existing customer",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "customer_id": {"type": "string", "description": "Customer ID to update"},
+                "email": {"type": "string", "description": "New email"},
+                "firstname": {"type": "string", "description": "New first name"},
+                "lastname": {"type": "string", "description": "New last name"},
+                "active": {"type": "boolean", "description": "Whether customer is active"}
+            },
+            "required": ["customer_id"],
+            "additionalProperties": False
+        }
+    ),
+    
+    # Orders
+    Tool(
+        name="get_orders",
+        description="Get PrestaShop orders",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "limit": {"type": "integer", "description": "Number of orders to retrieve", "default": 10},
+                "customer_id": {"type": "string", "description": "Filter by customer ID"},
+                "status": {"type": "string", "description": "Filter by order status"}
+            },
+            "additionalProperties": False
+        }
+    ),
+    Tool(
+        name="update_order_status",
+        description="Update order status",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "order_id": {"type": "string", "description": "Order ID"},
+                "status_id": {"type": "string", "description": "New status ID"}
+            },
+            "required": ["order_id", "status_id"],
+            "additionalProperties": False
+        }
+    ),
+    Tool(
+        name="get_order_states",
+        description="Get available order states/statuses",
+        inputSchema=_EMPTY_SCHEMA
+    ),
+    
+    # ============================================================================
+    # NEW EXTENDED FUNCTIONALITY
+    # ============================================================================
+    
+    # Module Management
+    Tool(
+        name="get_modules",
+        description="Get PrestaShop modules",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "limit": {"type": "integer", "description": "Number of modules to retrieve", "default": 20},
+                "module_name": {"type": "string", "description": "Filter by module name"}
+            },
+            "additionalProperties": False
+        }
+    ),
+    Tool(
+        name="get_module_by_name",
+        description="Get specific module by technical name",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "module_name": _DEFS["module_name"]
+            },
+            "required": ["module_name"],
+            "additionalProperties": False
+        }
+    ),
+    Tool(
+        name="install_module",
+        description="Install a PrestaShop module",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "module_name": {"type": "string", "description": "Module technical name to install"}
+            },
+            "required": ["module_name"],
+            "additionalProperties": False
+        }
+    ),
+    Tool(
+        name="update_module_status",
+        description="Activate or deactivate a module",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "module_name": _DEFS["module_name"],
+                "active": {"type": "boolean", "description": "Whether module should be active"}
+            },
+            "required": ["module_name", "active"],
+            "additionalProperties": False
+        }
+    ),
+    
+    # Main Menu (ps_mainmenu) Management
+    Tool(
+        name="get_main_menu_links",
+        description="Get ps_mainmenu navigation links",
+        inputSchema=_EMPTY_SCHEMA
+    ),
+    Tool(
+        name="update_main_menu_link",
+        description="Update a main menu navigation link",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "link_id": {"type": "string", "description": "Menu link ID to update"},
+                "name": _DEFS["link_name"],
+                "url": _DEFS["link_url"],
+                "active": {"type": "boolean", "description": "Whether link is active"}
+            },
+            "required": ["link_id"],
+            "additionalProperties": False
+        }
+    ),
+    Tool(
+        name="add_main_menu_link",
+        description="Add a new main menu navigation link",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "name": _DEFS["link_name"],
+                "url": _DEFS["link_url"],
+                "position": {"type": "integer", "description": "Menu position", "default": 0},
+                "active": {"type": "boolean", "description": "Whether link is active", "default": True}
+            },
+            "required": ["name", "url"],
+            "additionalProperties": False
+        }
+    ),
+    
+    # Navigation Tree (PS_MENU_TREE) Management
+    Tool(
+        name="get_menu_tree",
+        description="Get PS_MENU_TREE configuration - categories displayed in main navigation",
+        inputSchema=_EMPTY_SCHEMA
+    ),
+    Tool(
+        name="add_category_to_menu",
+        description="Add a category to the main navigation menu tree",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "category_id": {"type": "string", "description": "Category ID to add to navigation"},
+                "position": {"type": "integer", "description": "Position in menu (optional, defaults to end)"}
+            },
+            "required": ["category_id"],
+            "additionalProperties": False
+        }
+    ),
+    Tool(
+        name="remove_category_from_menu",
+        description="Remove a category from the main navigation menu tree",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "category_id": {"type": "string", "description": "Category ID to remove from navigation"}
+            },
+            "required": ["category_id"],
+            "additionalProperties": False
+        }
+    ),
+    Tool(
+        name="update_menu_tree",
+        description="Update the complete menu tree with new category order",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "category_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Array of category IDs in desired order"
+                }
+            },
+            "required": ["category_ids"],
+            "additionalProperties": False
+        }
+    ),
+    Tool(
+        name="get_menu_tree_status",
+        description="Get comprehensive menu tree status including both custom links and category navigation",
+        inputSchema=_EMPTY_SCHEMA
+    ),
+    
+    # Cache Management
+    Tool(
+        name="clear_cache",
+        description="Clear PrestaShop cache",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "cache_type": {"type": "string", "description": "Type of cache to clear", "default": "all", "enum": ["all"]}
+            },
+            "additionalProperties": False
+        }
+    ),
+    Tool(
+        name="get_cache_status",
+        description="Get current cache configuration status",
+        inputSchema=_EMPTY_SCHEMA
+    ),
+    
+    # Theme Management
+    Tool(
+        name="get_themes",
+        description="Get available themes and current theme settings",
+        inputSchema=_EMPTY_SCHEMA
+    ),
+    Tool(
+        name="update_theme_setting",
+        description="Update a theme configuration setting",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "setting_name": {"type": "string", "description": "Theme setting name (e.g., PS_LOGO, PS_THEME_NAME)"},
+                "value": {"type": "string", "description": "New setting value"}
+            },
+            "required": ["setting_name", "value"],
+            "additionalProperties": False
+        }
+    )
+]
 
 
 @server.list_tools()
 async def handle_list_tools():
     """List all available tools."""
-    return [
-        # Connection & Info
-        Tool(
-            name="test_connection",
-            description="Test PrestaShop API connection",
-            inputSchema={"type": "object", "properties": {}, "additionalProperties": False}
-        ),
-        Tool(
-            name="get_shop_info",
-            description="Get general shop information and statistics",
-            inputSchema={"type": "object", "properties": {}, "additionalProperties": False}
-        ),
-        
-        # Categories CRUD
-        Tool(
-            name="get_categories",
-            description="Get PrestaShop categories",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {"type": "integer", "description": "Number of categories to retrieve", "default": 10},
-                    "parent_id": {"type": "string", "description": "Filter by parent category ID"}
-                },
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="create_category",
-            description="Create a new category",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {"type": "string", "description": "Category name"},
-                    "description": {"type": "string", "description": "Category description"},
-                    "parent_id": {"type": "string", "description": "Parent category ID", "default": "2"},
-                    "active": {"type": "boolean", "description": "Whether category is active", "default": True}
-                },
-                "required": ["name"],
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="update_category",
-            description="Update an existing category",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "category_id": {"type": "string", "description": "Category ID to update"},
-                    "name": {"type": "string", "description": "New category name"},
-                    "description": {"type": "string", "description": "New category description"},
-                    "active": {"type": "boolean", "description": "Whether category is active"}
-                },
-                "required": ["category_id"],
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="delete_category",
-            description="Delete a category",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "category_id": {"type": "string", "description": "Category ID to delete"}
-                },
-                "required": ["category_id"],
-                "additionalProperties": False
-            }
-        ),
-        
-        # Unified Products Management
-        Tool(
-            name="get_products",
-            description="Unified product retrieval - supports both single product by ID and multiple products with comprehensive filtering and enhancement options",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "product_id": {"type": "string", "description": "Retrieve single product by ID (takes precedence over other params)"},
-                    "limit": {"type": "integer", "description": "Number of products to retrieve for list queries", "default": 10},
-                    "category_id": {"type": "string", "description": "Filter by category ID"},
-                    "name_filter": {"type": "string", "description": "Filter by product name"},
-                    "include_details": {"type": "boolean", "description": "Include complete product information", "default": False},
-                    "include_stock": {"type": "boolean", "description": "Include stock/inventory information", "default": False},
-                    "include_category_info": {"type": "boolean", "description": "Include category details", "default": False},
-                    "display": {"type": "string", "description": "Comma-separated list of specific fields to include (e.g., 'id,name,price')"}
-                },
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="create_product",
-            description="Create a new product",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {"type": "string", "description": "Product name"},
-                    "price": {"type": "number", "description": "Product price"},
-                    "description": {"type": "string", "description": "Product description"},
-                    "category_id": {"type": "string", "description": "Category ID"},
-                    "quantity": {"type": "integer", "description": "Initial stock quantity"},
-                    "reference": {"type": "string", "description": "Product reference/SKU"},
-                    "weight": {"type": "number", "description": "Product weight"}
-                },
-                "required": ["name", "price"],
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="update_product",
-            description="Update an existing product",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "product_id": {"type": "string", "description": "Product ID to update"},
-                    "name": {"type": "string", "description": "New product name"},
-                    "price": {"type": "number", "description": "New product price"},
-                    "description": {"type": "string", "description": "New product description"},
-                    "category_id": {"type": "string", "description": "New category ID"},
-                    "active": {"type": "boolean", "description": "Whether product is active"}
-                },
-                "required": ["product_id"],
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="delete_product",
-            description="Delete a product",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "product_id": {"type": "string", "description": "Product ID to delete"}
-                },
-                "required": ["product_id"],
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="update_product_stock",
-            description="Update product stock quantity",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "product_id": {"type": "string", "description": "Product ID"},
-                    "quantity": {"type": "integer", "description": "New stock quantity"}
-                },
-                "required": ["product_id", "quantity"],
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="update_product_price",
-            description="Update product price",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "product_id": {"type": "string", "description": "Product ID"},
-                    "price": {"type": "number", "description": "New price"},
-                    "wholesale_price": {"type": "number", "description": "New wholesale price"}
-                },
-                "required": ["product_id", "price"],
-                "additionalProperties": False
-            }
-        ),
-        
-        # Customers CRUD
-        Tool(
-            name="get_customers",
-            description="Get PrestaShop customers",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {"type": "integer", "description": "Number of customers to retrieve", "default": 10},
-                    "email_filter": {"type": "string", "description": "Filter by email"}
-                },
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="create_customer",
-            description="Create a new customer",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "email": {"type": "string", "description": "Customer email"},
-                    "firstname": {"type": "string", "description": "First name"},
-                    "lastname": {"type": "string", "description": "Last name"},
-                    "password": {"type": "string", "description": "Customer password"},
-                    "active": {"type": "boolean", "description": "Whether customer is active", "default": True}
-                },
-                "required": ["email", "firstname", "lastname", "password"],
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="update_customer",
-            description="Update an existing customer",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "customer_id": {"type": "string", "description": "Customer ID to update"},
-                    "email": {"type": "string", "description": "New email"},
-                    "firstname": {"type": "string", "description": "New first name"},
-                    "lastname": {"type": "string", "description": "New last name"},
-                    "active": {"type": "boolean", "description": "Whether customer is active"}
-                },
-                "required": ["customer_id"],
-                "additionalProperties": False
-            }
-        ),
-        
-        # Orders
-        Tool(
-            name="get_orders",
-            description="Get PrestaShop orders",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {"type": "integer", "description": "Number of orders to retrieve", "default": 10},
-                    "customer_id": {"type": "string", "description": "Filter by customer ID"},
-                    "status": {"type": "string", "description": "Filter by order status"}
-                },
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="update_order_status",
-            description="Update order status",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "order_id": {"type": "string", "description": "Order ID"},
-                    "status_id": {"type": "string", "description": "New status ID"}
-                },
-                "required": ["order_id", "status_id"],
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="get_order_states",
-            description="Get available order states/statuses",
-            inputSchema={"type": "object", "properties": {}, "additionalProperties": False}
-        ),
-        
-        # ============================================================================
-        # NEW EXTENDED FUNCTIONALITY
-        # ============================================================================
-        
-        # Module Management
-        Tool(
-            name="get_modules",
-            description="Get PrestaShop modules",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {"type": "integer", "description": "Number of modules to retrieve", "default": 20},
-                    "module_name": {"type": "string", "description": "Filter by module name"}
-                },
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="get_module_by_name",
-            description="Get specific module by technical name",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "module_name": {"type": "string", "description": "Module technical name"}
-                },
-                "required": ["module_name"],
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="install_module",
-            description="Install a PrestaShop module",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "module_name": {"type": "string", "description": "Module technical name to install"}
-                },
-                "required": ["module_name"],
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="update_module_status",
-            description="Activate or deactivate a module",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "module_name": {"type": "string", "description": "Module technical name"},
-                    "active": {"type": "boolean", "description": "Whether module should be active"}
-                },
-                "required": ["module_name", "active"],
-                "additionalProperties": False
-            }
-        ),
-        
-        # Main Menu (ps_mainmenu) Management
-        Tool(
-            name="get_main_menu_links",
-            description="Get ps_mainmenu navigation links",
-            inputSchema={"type": "object", "properties": {}, "additionalProperties": False}
-        ),
-        Tool(
-            name="update_main_menu_link",
-            description="Update a main menu navigation link",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "link_id": {"type": "string", "description": "Menu link ID to update"},
-                    "name": {"type": "string", "description": "Link display name"},
-                    "url": {"type": "string", "description": "Link URL"},
-                    "active": {"type": "boolean", "description": "Whether link is active"}
-                },
-                "required": ["link_id"],
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="add_main_menu_link",
-            description="Add a new main menu navigation link",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {"type": "string", "description": "Link display name"},
-                    "url": {"type": "string", "description": "Link URL"},
-                    "position": {"type": "integer", "description": "Menu position", "default": 0},
-                    "active": {"type": "boolean", "description": "Whether link is active", "default": True}
-                },
-                "required": ["name", "url"],
-                "additionalProperties": False
-            }
-        ),
-        
-        # Navigation Tree (PS_MENU_TREE) Management
-        Tool(
-            name="get_menu_tree",
-            description="Get PS_MENU_TREE configuration - categories displayed in main navigation",
-            inputSchema={"type": "object", "properties": {}, "additionalProperties": False}
-        ),
-        Tool(
-            name="add_category_to_menu",
-            description="Add a category to the main navigation menu tree",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "category_id": {"type": "string", "description": "Category ID to add to navigation"},
-                    "position": {"type": "integer", "description": "Position in menu (optional, defaults to end)"}
-                },
-                "required": ["category_id"],
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="remove_category_from_menu",
-            description="Remove a category from the main navigation menu tree",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "category_id": {"type": "string", "description": "Category ID to remove from navigation"}
-                },
-                "required": ["category_id"],
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="update_menu_tree",
-            description="Update the complete menu tree with new category order",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "category_ids": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Array of category IDs in desired order"
-                    }
-                },
-                "required": ["category_ids"],
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="get_menu_tree_status",
-            description="Get comprehensive menu tree status including both custom links and category navigation",
-            inputSchema={"type": "object", "properties": {}, "additionalProperties": False}
-        ),
-        
-        # Cache Management
-        Tool(
-            name="clear_cache",
-            description="Clear PrestaShop cache",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "cache_type": {"type": "string", "description": "Type of cache to clear", "default": "all", "enum": ["all"]}
-                },
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="get_cache_status",
-            description="Get current cache configuration status",
-            inputSchema={"type": "object", "properties": {}, "additionalProperties": False}
-        ),
-        
-        # Theme Management
-        Tool(
-            name="get_themes",
-            description="Get available themes and current theme settings",
-            inputSchema={"type": "object", "properties": {}, "additionalProperties": False}
-        ),
-        Tool(
-            name="update_theme_setting",
-            description="Update a theme configuration setting",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "setting_name": {"type": "string", "description": "Theme setting name (e.g., PS_LOGO, PS_THEME_NAME)"},
-                    "value": {"type": "string", "description": "New setting value"}
-                },
-                "required": ["setting_name", "value"],
-                "additionalProperties": False
-            }
-        )
-    ]
+    return _TOOLS
 
 
-@server.call_tool()
+# Argument validators generated from each inputSchema once at import time.
+# Defaults are not injected so handlers keep applying their own.
+if fastjsonschema is not None:
+    _VALIDATORS = {
+        tool.name: fastjsonschema.compile(tool.inputSchema, use_default=False)
+        for tool in _TOOLS
+    }
+else:
+    _VALIDATORS = {}
+
+# Recent MCP SDKs validate arguments with the interpreted jsonschema package
+# before calling the handler; skip that pass when compiled validators run
+if _VALIDATORS and 'validate_input' in inspect.signature(server.call_tool).parameters:
+    _CALL_TOOL_OPTIONS = {'validate_input': False}
+else:
+    _CALL_TOOL_OPTIONS = {}
+
+
+# ============================================================================
+# TOOL DISPATCH
+# ============================================================================
+
+async def _call_test_connection(client: PrestaShopClient, arguments: dict):
+    await client.check_connection()
+    return {"status": "success", "message": "API connection working", "xml_enabled": True}
+
+
+async def _call_get_products(client: PrestaShopClient, arguments: dict):
+    # Build filters dictionary
+    filters = {}
+    if arguments.get('category_id'):
+        filters['category'] = arguments['category_id']
+    if arguments.get('name_filter'):
+        filters['name'] = arguments['name_filter']
+    
+    return await client.get_products(
+        product_id=arguments.get('product_id'),
+        limit=arguments.get('limit', 10),
+        filters=filters if filters else None,
+        include_details=arguments.get('include_details', False),
+        include_stock=arguments.get('include_stock', False),
+        include_category_info=arguments.get('include_category_info', False),
+        display=arguments.get('display'),
+        raw=True
+    )
+
+
+# Optional fields forwarded to the partial-update client methods, only when
+# the caller supplied them
+_UPDATE_PRODUCT_FIELDS = ('name', 'price', 'description', 'category_id', 'active')
+_UPDATE_CUSTOMER_FIELDS = ('email', 'firstname', 'lastname', 'active')
+
+
+async def _call_update_product(client: PrestaShopClient, arguments: dict):
+    return await client.update_product(
+        product_id=arguments['product_id'],
+        **{key: arguments[key] for key in _UPDATE_PRODUCT_FIELDS if key in arguments}
+    )
+
+
+async def _call_update_customer(client: PrestaShopClient, arguments: dict):
+    return await client.update_customer(
+        customer_id=arguments['customer_id'],
+        **{key: arguments[key] for key in _UPDATE_CUSTOMER_FIELDS if key in arguments}
+    )
+
+
+# Tool name -> handler(client, arguments) returning an awaitable result;
+# one hashed lookup per call instead of walking an if/elif chain
+_DISPATCH = {
+    # Connection & Info
+    "test_connection": _call_test_connection,
+    "get_shop_info": lambda c, a: c.get_shop_info(),
+    
+    # Categories CRUD
+    "get_categories": lambda c, a: c.get_categories(
+        limit=a.get('limit', 10),
+        parent_id=a.get('parent_id')
+    ),
+    "create_category": lambda c, a: c.create_category(
+        name=a['name'],
+        description=a.get('description'),
+        parent_id=a.get('parent_id', '2'),
+        active=a.get('active', True)
+    ),
+    "update_category": lambda c, a: c.update_category(
+        category_id=a['category_id'],
+        name=a.get('name'),
+        description=a.get('description'),
+        active=a.get('active')
+    ),
+    "delete_category": lambda c, a: c.delete_category(a['category_id']),
+    
+    # Unified Products Management
+    "get_products": _call_get_products,
+    "create_product": lambda c, a: c.create_product(
+        name=a['name'],
+        price=a['price'],
+        description=a.get('description'),
+        category_id=a.get('category_id'),
+        quantity=a.get('quantity'),
+        reference=a.get('reference'),
+        weight=a.get('weight')
+    ),
+    "update_product": _call_update_product,
+    "delete_product": lambda c, a: c.delete_product(a['product_id']),
+    "update_product_stock": lambda c, a: c.update_product_stock(
+        product_id=a['product_id'],
+        quantity=a['quantity']
+    ),
+    "update_product_price": lambda c, a: c.update_product_price(
+        product_id=a['product_id'],
+        price=a['price'],
+        wholesale_price=a.get('wholesale_price')
+    ),
+    
+    # Customers CRUD
+    "get_customers": lambda c, a: c.get_customers(
+        limit=a.get('limit', 10),
+        email=a.get('email_filter'),
+        raw=True
+    ),
+    "create_customer": lambda c, a: c.create_customer(
+        email=a['email'],
+        firstname=a['firstname'],
+        lastname=a['lastname'],
+        password=a['password'],
+        active=a.get('active', True)
+    ),
+    "update_customer": _call_update_customer,
+    
+    # Orders
+    "get_orders": lambda c, a: c.get_orders(
+        limit=a.get('limit', 10),
+        customer_id=a.get('customer_id'),
+        status=a.get('status'),
+        raw=True
+    ),
+    "update_order_status": lambda c, a: c.update_order_status(
+        order_id=a['order_id'],
+        status_id=a['status_id']
+    ),
+    "get_order_states": lambda c, a: c.get_order_states(),
+    
+    # Module Management
+    "get_modules": lambda c, a: c.get_modules(
+        limit=a.get('limit', 20),
+        module_name=a.get('module_name')
+    ),
+    "get_module_by_name": lambda c, a: c.get_module_by_name(a['module_name']),
+    "install_module": lambda c, a: c.install_module(a['module_name']),
+    "update_module_status": lambda c, a: c.update_module_status(
+        module_name=a['module_name'],
+        active=a['active']
+    ),
+    
+    # Main Menu Management
+    "get_main_menu_links": lambda c, a: c.get_main_menu_links(),
+    "update_main_menu_link": lambda c, a: c.update_main_menu_link(
+        link_id=a['link_id'],
+        name=a.get('name'),
+        url=a.get('url'),
+        active=a.get('active')
+    ),
+    "add_main_menu_link": lambda c, a: c.add_main_menu_link(
+        name=a['name'],
+        url=a['url'],
+        position=a.get('position', 0),
+        active=a.get('active', True)
+    ),
+    
+    # Navigation Tree Management
+    "get_menu_tree": lambda c, a: c.get_menu_tree(),
+    "add_category_to_menu": lambda c, a: c.add_category_to_menu(
+        category_id=a['category_id'],
+        position=a.get('position')
+    ),
+    "remove_category_from_menu": lambda c, a: c.remove_category_from_menu(
+        category_id=a['category_id']
+    ),
+    "update_menu_tree": lambda c, a: c.update_menu_tree(
+        category_ids=a['category_ids']
+    ),
+    "get_menu_tree_status": lambda c, a: c.get_menu_tree_status(),
+    
+    # Cache Management
+    "clear_cache": lambda c, a: c.clear_cache(
+        cache_type=a.get('cache_type', 'all')
+    ),
+    "get_cache_status": lambda c, a: c.get_cache_status(),
+    
+    # Theme Management
+    "get_themes": lambda c, a: c.get_themes(),
+    "update_theme_setting": lambda c, a: c.update_theme_setting(
+        setting_name=a['setting_name'],
+        value=a['value']
+    ),
+}
+
+
+# Idempotent tools whose concurrent identical calls may share one request
+_READ_ONLY_TOOLS = frozenset({
+    "test_connection",
+    "get_shop_info",
+    "get_categories",
+    "get_products",
+    "get_customers",
+    "get_orders",
+    "get_order_states",
+    "get_modules",
+    "get_module_by_name",
+    "get_main_menu_links",
+    "get_menu_tree",
+    "get_menu_tree_status",
+    "get_cache_status",
+    "get_themes",
+})
+
+# Argument names of each read-only tool in schema order. Cache and in-flight
+# keys read these fields positionally instead of sorting the arguments dict;
+# names outside the schema are ignored by the handlers and so by the keys
+_KEY_FIELDS = {
+    tool.name: tuple(tool.inputSchema["properties"])
+    for tool in _TOOLS
+    if tool.name in _READ_ONLY_TOOLS
+}
+
+# (tool name, frozen arguments) -> task of the call currently in flight
+_INFLIGHT = {}
+
+# Read results served from memory for a short while. Order states almost
+# never change; listings keep a short TTL for changes made outside this
+# server. Every write tool empties all of them, see _run_write
+_RESULT_CACHES = {
+    "get_order_states": TTLCache(ttl=3600),
+    "get_shop_info": TTLCache(ttl=10),
+    "get_orders": TTLCache(ttl=10),
+    "get_products": TTLCache(ttl=10),
+    "get_categories": TTLCache(ttl=10),
+    "get_customers": TTLCache(ttl=10),
+}
+
+
+# Results that rarely change outside deployments, also persisted across
+# restarts (TTL in seconds) when PRESTASHOP_CACHE_DIR is set
+_PERSISTED_TOOLS = {
+    "get_order_states": 86400,
+    "get_shop_info": 86400,
+}
+
+# diskcache tag of persisted tool results, so writes evict only those and
+# leave other entries (e.g. the startup probe marker) in place
+_RESULT_TAG = "tool_result"
+
+_disk_cache = None
+
+
+def _get_disk_cache():
+    """Return the persistent result cache, or None when it is not configured."""
+    global _disk_cache
+    if _disk_cache is None and diskcache is not None:
+        cache_dir = _get_client().config.cache_dir
+        if cache_dir:
+            _disk_cache = diskcache.Cache(cache_dir)
+    return _disk_cache
+
+
+async def _run_read_only(name: str, handler, arguments: dict):
+    """Run a read-only tool through its result cache and in-flight coalescing."""
+    key = (name, *map(arguments.get, _KEY_FIELDS[name]))
+    try:
+        hash(key)
+    except TypeError:
+        # Unhashable argument values cannot be keyed; just run the call
+        return await handler(_get_client(), arguments)
+    
+    cache = _RESULT_CACHES.get(name)
+    if cache is not None:
+        result = cache.get(key)
+        if result is not MISSING:
+            return result
+    
+    disk_ttl = _PERSISTED_TOOLS.get(name)
+    disk = _get_disk_cache() if disk_ttl else None
+    if disk is not None:
+        # Keyed by shop so several shops can share one cache directory
+        disk_key = (_get_client().config.shop_url, *key)
+        result = disk.get(disk_key, MISSING)
+        if result is not MISSING:
+            if cache is not None:
+                cache.set(key, result)
+            return result
+    
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(handler(_get_client(), arguments))
+        _INFLIGHT[key] = task
+        task.add_done_callback(lambda _: _INFLIGHT.pop(key, None))
+    
+    # Shielded so one caller being cancelled does not cancel the shared call
+    result = await asyncio.shield(task)
+    
+    if not (isinstance(result, dict) and 'error' in result):
+        if cache is not None:
+            cache.set(key, result)
+        if disk is not None:
+            disk.set(disk_key, result, expire=disk_ttl, tag=_RESULT_TAG)
+    return result
+
+
+async def _run_write(handler, arguments: dict):
+    """Run a mutating tool, then drop cached read results it may have staled."""
+    try:
+        return await handler(_get_client(), arguments)
+    finally:
+        # Also after failures: the shop may have applied part of the change
+        for cache in _RESULT_CACHES.values():
+            cache.clear()
+        if _disk_cache is not None:
+            _disk_cache.evict(_RESULT_TAG)
+
+
+@server.call_tool(**_CALL_TOOL_OPTIONS)
 async def handle_call_tool(name: str, arguments: dict):
     """Handle all tool calls using the PrestaShopClient with proper XML support."""
+    # Dispatch keys are interned literals; interning the incoming name lets
+    # the dict lookup match on identity after the hash comparison
+    name = sys.intern(name)
+
+    validator = _VALIDATORS.get(name)
+    if validator is not None:
+        try:
+            validator(arguments)
+        except fastjsonschema.JsonSchemaValueException as e:
+            return [TextContent(type="text", text=_error_text(_VALIDATION_ERROR_TEMPLATE, e.message))]
     
     try:
-        # Initialize the config and client
-        config = Config()
-        
-        async with PrestaShopClient(config) as client:
-            
-            # Connection & Info
-            if name == "test_connection":
-                result = await client.get_configurations()
-                if 'error' not in result:
-                    result = {"status": "success", "message": "API connection working", "xml_enabled": True}
-            
-            elif name == "get_shop_info":
-                result = await client.get_shop_info()
-            
-            # Categories CRUD
-            elif name == "get_categories":
-                result = await client.get_categories(
-                    limit=arguments.get('limit', 10),
-                    parent_id=arguments.get('parent_id')
-                )
-            
-            elif name == "create_category":
-                result = await client.create_category(
-                    name=arguments['name'],
-                    description=arguments.get('description'),
-                    parent_id=arguments.get('parent_id', '2'),
-                    active=arguments.get('active', True)
-                )
-            
-            elif name == "update_category":
-                result = await client.update_category(
-                    category_id=arguments['category_id'],
-                    name=arguments.get('name'),
-                    description=arguments.get('description'),
-                    active=arguments.get('active')
-                )
-            
-            elif name == "delete_category":
-                result = await client.delete_category(arguments['category_id'])
-            
-            # Unified Products Management
-            elif name == "get_products":
-                # Build filters dictionary
-                filters = {}
-                if arguments.get('category_id'):
-                    filters['category'] = arguments['category_id']
-                if arguments.get('name_filter'):
-                    filters['name'] = arguments['name_filter']
-                
-                result = await client.get_products(
-                    product_id=arguments.get('product_id'),
-                    limit=arguments.get('limit', 10),
-                    filters=filters if filters else None,
-                    include_details=arguments.get('include_details', False),
-                    include_stock=arguments.get('include_stock', False),
-                    include_category_info=arguments.get('include_category_info', False),
-                    display=arguments.get('display')
-                )
-            
-            elif name == "create_product":
-                result = await client.create_product(
-                    name=arguments['name'],
-                    price=arguments['price'],
-                    description=arguments.get('description'),
-                    category_id=arguments.get('category_id'),
-                    quantity=arguments.get('quantity'),
-                    reference=arguments.get('reference'),
-                    weight=arguments.get('weight')
-                )
-            
-            elif name == "update_product":
-                # Prepare kwargs for update
-                update_kwargs = {}
-                for key in ['name', 'price', 'description', 'category_id', 'active']:
-                    if key in arguments:
-                        update_kwargs[key] = arguments[key]
-                
-                result = await client.update_product(
-                    product_id=arguments['product_id'],
-                    **update_kwargs
-                )
-            
-            elif name == "delete_product":
-                result = await client.delete_product(arguments['product_id'])
-            
-            elif name == "update_product_stock":
-                result = await client.update_product_stock(
-                    product_id=arguments['product_id'],
-                    quantity=arguments['quantity']
-                )
-            
-            elif name == "update_product_price":
-                result = await client.update_product_price(
-                    product_id=arguments['product_id'],
-                    price=arguments['price'],
-                    wholesale_price=arguments.get('wholesale_price')
-                )
-            
-            # Customers CRUD
-            elif name == "get_customers":
-                result = await client.get_customers(
-                    limit=arguments.get('limit', 10),
-                    email=arguments.get('email_filter')
-                )
-            
-            elif name == "create_customer":
-                result = await client.create_customer(
-                    email=arguments['email'],
-                    firstname=arguments['firstname'],
-                    lastname=arguments['lastname'],
-                    password=arguments['password'],
-                    active=arguments.get('active', True)
-                )
-            
-            elif name == "update_customer":
-                # Prepare kwargs for update
-                update_kwargs = {}
-                for key in ['email', 'firstname', 'lastname', 'active']:
-                    if key in arguments:
-                        update_kwargs[key] = arguments[key]
-                
-                result = await client.update_customer(
-                    customer_id=arguments['customer_id'],
-                    **update_kwargs
-                )
-            
-            # Orders
-            elif name == "get_orders":
-                result = await client.get_orders(
-                    limit=arguments.get('limit', 10),
-                    customer_id=arguments.get('customer_id'),
-                    status=arguments.get('status')
-                )
-            
-            elif name == "update_order_status":
-                result = await client.update_order_status(
-                    order_id=arguments['order_id'],
-                    status_id=arguments['status_id']
-                )
-            
-            elif name == "get_order_states":
-                result = await client.get_order_states()
-            
-            # ============================================================================
-            # NEW EXTENDED FUNCTIONALITY HANDLERS
-            # ============================================================================
-            
-            # Module Management
-            elif name == "get_modules":
-                result = await client.get_modules(
-                    limit=arguments.get('limit', 20),
-                    module_name=arguments.get('module_name')
-                )
-            
-            elif name == "get_module_by_name":
-                result = await client.get_module_by_name(arguments['module_name'])
-            
-            elif name == "install_module":
-                result = await client.install_module(arguments['module_name'])
-            
-            elif name == "update_module_status":
-                result = await client.update_module_status(
-                    module_name=arguments['module_name'],
-                    active=arguments['active']
-                )
-            
-            # Main Menu Management
-            elif name == "get_main_menu_links":
-                result = await client.get_main_menu_links()
-            
-            elif name == "update_main_menu_link":
-                result = await client.update_main_menu_link(
-                    link_id=arguments['link_id'],
-                    name=arguments.get('name'),
-                    url=arguments.get('url'),
-                    active=arguments.get('active')
-                )
-            
-            elif name == "add_main_menu_link":
-                result = await client.add_main_menu_link(
-                    name=arguments['name'],
-                    url=arguments['url'],
-                    position=arguments.get('position', 0),
-                    active=arguments.get('active', True)
-                )
-            
-            # Navigation Tree Management
-            elif name == "get_menu_tree":
-                result = await client.get_menu_tree()
-            
-            elif name == "add_category_to_menu":
-                result = await client.add_category_to_menu(
-                    category_id=arguments['category_id'],
-                    position=arguments.get('position')
-                )
-            
-            elif name == "remove_category_from_menu":
-                result = await client.remove_category_from_menu(
-                    category_id=arguments['category_id']
-                )
-            
-            elif name == "update_menu_tree":
-                result = await client.update_menu_tree(
-                    category_ids=arguments['category_ids']
-                )
-            
-            elif name == "get_menu_tree_status":
-                result = await client.get_menu_tree_status()
-            
-            # Cache Management
-            elif name == "clear_cache":
-                result = await client.clear_cache(
-                    cache_type=arguments.get('cache_type', 'all')
-                )
-            
-            elif name == "get_cache_status":
-                result = await client.get_cache_status()
-            
-            # Theme Management
-            elif name == "get_themes":
-                result = await client.get_themes()
-            
-            elif name == "update_theme_setting":
-                result = await client.update_theme_setting(
-                    setting_name=arguments['setting_name'],
-                    value=arguments['value']
-                )
-            
-            else:
-                result = {"error": f"Unknown tool: {name}"}
+        handler = _DISPATCH.get(name)
+        if handler is None:
+            result = {"error": f"Unknown tool: {name}"}
+        elif name in _READ_ONLY_TOOLS:
+            result = await _run_read_only(name, handler, arguments)
+        else:
+            result = await _run_write(handler, arguments)
         
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        if _client_accepts_msgpack():
+            return [_msgpack_content(name, result)]
+        return [TextContent(type="text", text=_encode_result(result))]
     
     except PrestaShopAPIError as e:
-        error_result = {"error": f"PrestaShop API Error: {str(e)}", "type": "api_error"}
-        return [TextContent(type="text", text=json.dumps(error_result, indent=2))]
+        return [TextContent(type="text", text=_error_text(_API_ERROR_TEMPLATE, e))]
     
     except Exception as e:
-        error_result = {"error": f"Tool execution failed: {str(e)}", "type": "internal_error"}
-        return [TextContent(type="text", text=json.dumps(error_result, indent=2))]
+        return [TextContent(type="text", text=_error_text(_INTERNAL_ERROR_TEMPLATE, e))]
+
+
+# Written once at startup as pre-encoded ASCII in a single stderr write
+_BANNER = b"PrestaShop MCP server starting: full CRUD operations + navigation tree management\n"
+
+
+def _write_banner() -> None:
+    """Write the startup banner to stderr."""
+    stream = getattr(sys.stderr, 'buffer', None)
+    if stream is None:
+        # stderr replaced by a text-only stream (e.g. under a test runner)
+        sys.stderr.write(_BANNER.decode('ascii'))
+        return
+    sys.stderr.flush()
+    stream.write(_BANNER)
+    stream.flush()
+
+
+# Seconds a successful startup probe is remembered in the persistent cache
+_PROBE_OK_TTL = 600
+
+
+async def _check_api_connection(client: PrestaShopClient) -> None:
+    """Report whether the PrestaShop API is reachable, without raising."""
+    try:
+        # Warm restarts with unchanged credentials skip the probe; a key that
+        # stopped working still surfaces on the first tool call
+        disk = _get_disk_cache()
+        key_digest = hashlib.blake2b(client.config.api_key.encode(), digest_size=8).hexdigest()
+        probe_key = f"probe_ok:{client.config.shop_url}:{key_digest}"
+        if disk is not None and disk.get(probe_key):
+            print("✅ API probe skipped (verified recently)", file=sys.stderr)
+            return
+        
+        print("🧪 Testing API connection with extended functionality...", file=sys.stderr)
+        await client.check_connection()
+        print("✅ API connection successful (modules, cache, themes & navigation tree available)", file=sys.stderr)
+        if disk is not None:
+            disk.set(probe_key, True, expire=_PROBE_OK_TTL)
+    except Exception as e:
+        print(f"❌ API test error: {e}", file=sys.stderr)
 
 
 async def main():
     """Run the PrestaShop MCP server."""
-    # Quick API test using the proper client
+    global _client, _disk_cache
+    
     try:
-        config = Config()
-        async with PrestaShopClient(config) as client:
-            print("🧪 Testing API connection with extended functionality...", file=sys.stderr)
-            result = await client.get_configurations()
-            if 'error' not in result:
-                print("✅ API connection successful with extended functionality", file=sys.stderr)
-                print("🆕 New features: Module, Cache, Theme & Navigation Tree management", file=sys.stderr)
-            else:
-                print(f"❌ API test failed: {result.get('error')}", file=sys.stderr)
-                return
+        _client = PrestaShopClient(Config())
     except Exception as e:
         print(f"❌ API test error: {e}", file=sys.stderr)
         return
     
-    # Run server
-    print("🚀 Starting Enhanced PrestaShop MCP server...", file=sys.stderr)
-    print("✅ Server ready with full CRUD operations + Navigation Tree management", file=sys.stderr)
+    # The API check runs alongside server startup instead of gating it; a
+    # failing shop surfaces through the first tool call that needs it
+    api_check = asyncio.ensure_future(_check_api_connection(_client))
     
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="prestashop-mcp",
-                server_version="4.0.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
+    try:
+        # Run server
+        _write_banner()
+        
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name=SERVER_NAME,
+                    server_version=SERVER_VERSION,
+                    capabilities=server.get_capabilities(
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities=(
+                            {_MSGPACK_CAPABILITY: {}} if msgpack is not None else {}
+                        ),
+                    ),
                 ),
-            ),
-        )
+            )
+    finally:
+        api_check.cancel()
+        await _client.close()
+        _client = None
+        if _disk_cache is not None:
+            _disk_cache.close()
+            _disk_cache = None
+
+
+def run() -> None:
+    """Run the MCP server, on uvloop when it is installed."""
+    if uvloop is None:
+        asyncio.run(main())
+    elif sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            runner.run(main())
+    else:
+        uvloop.install()
+        asyncio.run(main())
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run()
@@ -0,0 +1,31 @@
+"""Tests for in-process caches."""
+
+from src.prestashop_mcp import cache as cache_module
+from src.prestashop_mcp.cache import MISSING, TTLCache
+
+
+class TestTTLCache:
+    """Test TTL cache expiry and bounds."""
+
+    def test_ttl_cache_expiry_and_bound(self, monkeypatch):
+        """Test TTL cache entries expire and the oldest entry is evicted."""
+        now = [100.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+
+        cache = TTLCache(ttl=10, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+        assert cache.get("a") is MISSING
+        assert cache.get("c") == 3
+
+        now[0] += 10
+        assert cache.get("b") is MISSING
+
+    def test_discard(self):
+        """Test discard removes a single entry and ignores missing keys."""
+        cache = TTLCache(ttl=10)
+        cache.set("a", 1)
+        cache.discard("a")
+        cache.discard("missing")
+        assert cache.get("a") is MISSING
@@ -4,9 +4,18 @@ import os
 import pytest
 from unittest.mock import patch
 
+from src.prestashop_mcp import config as config_module
 from src.prestashop_mcp.config import Config
 
 
+@pytest.fixture(autouse=True)
+def fresh_env_snapshot():
+    """Make from_env() read the environment patched by each test."""
+    config_module._env_snapshot.cache_clear()
+    yield
+    config_module._env_snapshot.cache_clear()
+
+
 class TestConfig:
     """Test configuration management."""
     
@@ -6,16 +6,44 @@ Comprehensive testing of fixed CREATE and UPDATE operations
 """
 
 import asyncio
+import io
 import json
+import secrets
 import sys
-import time
-import random
+from contextvars import ContextVar
 from typing import Dict, Any
 
 from src.prestashop_mcp.prestashop_client import PrestaShopClient
 from src.prestashop_mcp.config import Config
 
 
+# Output and results of the test path running in the current task;
+# concurrent paths each collect their own, flushed in one piece when the
+# path ends
+_section_output = ContextVar("_section_output", default=None)
+_section_results = ContextVar("_section_results", default=None)
+
+
+def _emit(*values):
+    """print() into the current path's buffer, or to stdout outside a path."""
+    buffer = _section_output.get()
+    print(*values, file=buffer if buffer is not None else sys.stdout)
+
+
+async def _run_buffered(test_path):
+    """Run one test path with its output held back until it finishes; returns its results."""
+    # gather runs each path in its own task, so these are private to it
+    buffer = io.StringIO()
+    results = []
+    _section_output.set(buffer)
+    _section_results.set(results)
+    try:
+        await test_path()
+    finally:
+        sys.stdout.write(buffer.getvalue())
+    return results
+
+
 class CRUDTestSuite:
     """Enhanced CRUD test suite for PrestaShop MCP Client with better error handling."""
     
@@ -23,7 +51,8 @@ class CRUDTestSuite:
         self.config = config
         self.client = PrestaShopClient(config)
         self.test_results = []
-        self.timestamp = int(time.time())
+        # One random id keeps names and emails unique across concurrent subtests
+        self.uid = secrets.token_hex(6)
         
     async def log_test(self, test_name: str, success: bool, details: str = ""):
         """Log test result."""
@@ -34,20 +63,21 @@ class CRUDTestSuite:
             "success": success,
             "details": details
         }
-        self.test_results.append(result)
-        print(f"{status}: {test_name}")
+        path_results = _section_results.get()
+        (path_results if path_results is not None else self.test_results).append(result)
+        _emit(f"{status}: {test_name}")
         if details:
-            print(f"   Details: {details}")
+            _emit(f"   Details: {details}")
     
     async def test_category_crud(self):
         """Test complete Category CRUD operations."""
-        print("\n🔄 Testing Category CRUD Operations...")
+        _emit("\n🔄 Testing Category CRUD Operations...")
         
         # CREATE
         try:
             create_result = await self.client.create_category(
-                name=f"Test Category CRUD {self.timestamp}",
-                description=f"Category created by CRUD test suite at {self.timestamp}",
+                name=f"Test Category CRUD {self.uid}",
+                description=f"Category created by CRUD test suite (run {self.uid})",
                 active=True
             )
             
@@ -59,8 +89,8 @@ class CRUDTestSuite:
                 try:
                     update_result = await self.client.update_category(
                         category_id=category_id,
-                        name=f"Updated Test Category {self.timestamp}",
-                        description=f"Updated by CRUD test suite at {self.timestamp}"
+                        name=f"Updated Test Category {self.uid}",
+                        description=f"Updated by CRUD test suite (run {self.uid})"
                     )
                     await self.log_test("Category UPDATE", True, "Category updated successfully")
                     
@@ -87,29 +117,35 @@ class CRUDTestSuite:
     
     async def test_product_crud(self):
         """Test complete Product CRUD operations."""
-        print("\n🔄 Testing Product CRUD Operations...")
+        _emit("\n🔄 Testing Product CRUD Operations...")
         
         # CREATE
         try:
             create_result = await self.client.create_product(
-                name=f"Test Product CRUD {self.timestamp}",
+                name=f"Test Product CRUD {self.uid}",
                 price=29.99,
-                description=f"Product created by CRUD test suite at {self.timestamp}",
+                description=f"Product created by CRUD test suite (run {self.uid})",
                 quantity=10,
-                reference=f"TEST-CRUD-{self.timestamp}"
+                reference=f"TEST-CRUD-{self.uid}"
             )
             
             if 'product' in create_result and 'id' in create_result['product']:
                 product_id = create_result['product']['id']
                 await self.log_test("Product CREATE", True, f"Created product ID: {product_id}")
                 
+                # The stock row lookup for the stock update below does not depend
+                # on the product update, so it is prefetched alongside it
+                stock_lookup = asyncio.ensure_future(
+                    self.client.get_product_stock_availables(product_id)
+                )
+                
                 # UPDATE
                 try:
                     update_result = await self.client.update_product(
                         product_id=product_id,
-                        name=f"Updated Test Product {self.timestamp}",
+                        name=f"Updated Test Product {self.uid}",
                         price=39.99,
-                        description=f"Updated by CRUD test suite at {self.timestamp}"
+                        description=f"Updated by CRUD test suite (run {self.uid})"
                     )
                     await self.log_test("Product UPDATE", True, "Product updated successfully")
                     
@@ -117,7 +153,8 @@ class CRUDTestSuite:
                     try:
                         stock_result = await self.client.update_product_stock(
                             product_id=product_id,
-                            quantity=25
+                            quantity=25,
+                            stock_response=await stock_lookup
                         )
                         await self.log_test("Product STOCK UPDATE", True, "Stock updated successfully")
                     except Exception as e:
@@ -143,6 +180,7 @@ class CRUDTestSuite:
                         
                 except Exception as e:
                     await self.log_test("Product UPDATE", False, str(e))
+                    stock_lookup.cancel()
                     # Cleanup failed update
                     try:
                         await self.client.delete_product(product_id)
@@ -157,12 +195,11 @@ class CRUDTestSuite:
     
     async def test_customer_crud(self):
         """Test complete Customer CRUD operations with unique email handling."""
-        print("\n🔄 Testing Customer CRUD Operations...")
+        _emit("\n🔄 Testing Customer CRUD Operations...")
         
         # Generate unique email to avoid conflicts
-        random_suffix = random.randint(1000, 9999)
-        original_email = f"test-crud-{self.timestamp}-{random_suffix}@example.com"
-        updated_email = f"updated-crud-{self.timestamp}-{random_suffix}@example.com"
+        original_email = f"test-crud-{self.uid}@example.com"
+        updated_email = f"updated-crud-{self.uid}@example.com"
         
         # CREATE
         try:
@@ -202,27 +239,33 @@ class CRUDTestSuite:
     
     async def test_order_operations(self):
         """Test Order status operations."""
-        print("\n🔄 Testing Order Operations...")
+        _emit("\n🔄 Testing Order Operations...")
         
-        # GET ORDER STATES
-        try:
-            states_result = await self.client.get_order_states()
-            if 'order_states' in states_result:
-                await self.log_test("Get ORDER STATES", True, f"Retrieved {len(states_result['order_states'])} states")
-            else:
-                await self.log_test("Get ORDER STATES", False, "No order states returned")
-        except Exception as e:
-            await self.log_test("Get ORDER STATES", False, str(e))
+        # GET ORDER STATES and the order to update are independent reads
+        states_result, orders_result = await asyncio.gather(
+            self.client.get_order_states(),
+            self.client.get_orders(limit=1),
+            return_exceptions=True
+        )
+        
+        if isinstance(states_result, Exception):
+            await self.log_test("Get ORDER STATES", False, str(states_result))
+        elif 'order_states' in states_result:
+            await self.log_test("Get ORDER STATES", True, f"Retrieved {len(states_result['order_states'])} states")
+        else:
+            await self.log_test("Get ORDER STATES", False, "No order states returned")
         
         # ORDER STATUS UPDATE - only test if we have existing orders
         try:
-            orders_result = await self.client.get_orders(limit=1)
+            if isinstance(orders_result, Exception):
+                raise orders_result
             if 'orders' in orders_result and orders_result['orders']:
                 # Get first order for testing
                 order_id = orders_result['orders'][0]['id']
                 
-                # Get available states
-                states_result = await self.client.get_order_states()
+                # Reuse the states fetched above
+                if isinstance(states_result, Exception):
+                    raise states_result
                 if 'order_states' in states_result and states_result['order_states']:
                     # Use first available state for testing
                     status_id = states_result['order_states'][0]['id']
@@ -238,70 +281,71 @@ class CRUDTestSuite:
     
     async def test_read_operations(self):
         """Test READ operations to ensure they still work."""
-        print("\n🔄 Testing READ Operations...")
+        _emit("\n🔄 Testing READ Operations...")
         
-        # Test Categories
-        try:
-            categories = await self.client.get_categories(limit=5)
-            await self.log_test("READ Categories", True, f"Retrieved categories successfully")
-        except Exception as e:
-            await self.log_test("READ Categories", False, str(e))
-        
-        # Test Products
-        try:
-            products = await self.client.get_products(limit=5)
-            await self.log_test("READ Products", True, f"Retrieved products successfully")
-        except Exception as e:
-            await self.log_test("READ Products", False, str(e))
-        
-        # Test Customers
-        try:
-            customers = await self.client.get_customers(limit=5)
-            await self.log_test("READ Customers", True, f"Retrieved customers successfully")
-        except Exception as e:
-            await self.log_test("READ Customers", False, str(e))
+        # The reads are independent, so they run concurrently
+        reads = {
+            "READ Categories": self.client.get_categories(limit=5),
+            "READ Products": self.client.get_products(limit=5),
+            "READ Customers": self.client.get_customers(limit=5),
+            "READ Shop Info": self.client.get_shop_info(),
+        }
+        results = await asyncio.gather(*reads.values(), return_exceptions=True)
         
-        # Test Shop Info
-        try:
-            shop_info = await self.client.get_shop_info()
-            await self.log_test("READ Shop Info", True, f"Retrieved shop info successfully")
-        except Exception as e:
-            await self.log_test("READ Shop Info", False, str(e))
+        for test_name, result in zip(reads, results):
+            if isinstance(result, Exception):
+                await self.log_test(test_name, False, str(result))
+            else:
+                label = test_name.split(" ", 1)[1].lower()
+                await self.log_test(test_name, True, f"Retrieved {label} successfully")
     
     async def run_comprehensive_test(self):
         """Run all CRUD tests."""
         print("🚀 Starting Comprehensive CRUD Test Suite")
         print("=" * 60)
         
+        # Reads go first to warm the connection pool; the CRUD paths touch
+        # separate resources, so they run concurrently afterwards, each with
+        # its progress log buffered so the logs do not interleave
         await self.test_read_operations()
-        await self.test_category_crud()
-        await self.test_product_crud()
-        await self.test_customer_crud()
-        await self.test_order_operations()
+        path_results = await asyncio.gather(
+            _run_buffered(self.test_category_crud),
+            _run_buffered(self.test_product_crud),
+            _run_buffered(self.test_customer_crud),
+            _run_buffered(self.test_order_operations)
+        )
+        # Results are summarised grouped by path, in the order listed above
+        for results in path_results:
+            self.test_results.extend(results)
         
         # Summary
         print("\n" + "=" * 60)
         print("📊 TEST SUMMARY")
         print("=" * 60)
         
+        # One pass collects both report sections and the failure count
+        failed_lines = []
+        detailed_lines = []
+        for result in self.test_results:
+            if not result['success']:
+                failed_lines.append(f"   • {result['test']}: {result['details']}")
+            detailed_lines.append(f"   {result['status']}: {result['test']}")
+        
         total_tests = len(self.test_results)
-        passed_tests = len([r for r in self.test_results if r['success']])
-        failed_tests = total_tests - passed_tests
+        failed_tests = len(failed_lines)
+        passed_tests = total_tests - failed_tests
         
         print(f"Total Tests: {total_tests}")
         print(f"✅ Passed: {passed_tests}")
         print(f"❌ Failed: {failed_tests}")
         print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
         
-        if failed_tests > 0:
+        if failed_lines:
             print("\n❌ FAILED TESTS:")
-            for result in self.test_results:
-                if not result['success']:
-                    print(f"   • {result['test']}: {result['details']}")
+            print("\n".join(failed_lines))
         
         print("\n📋 DETAILED RESULTS:")
-        for result in self.test_results:
-            print(f"   {result['status']}: {result['test']}")
+        print("\n".join(detailed_lines))
         
         # Show improvement message
         if failed_tests == 0:
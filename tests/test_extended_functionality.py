@@ -5,234 +5,301 @@ Tests for Module Management, Cache Management, Theme Management, and Main Menu M
 """
 
 import asyncio
-import json
+import functools
+import io
 import os
-from typing import Dict, Any, Optional
+import sys
+import time
+from contextvars import ContextVar
+from itertools import islice
+from typing import Dict, Any
+
+try:
+    import uvloop
+except ImportError:  # optional speedup, not available on Windows
+    uvloop = None
 
 from src.prestashop_mcp.config import Config
-from src.prestashop_mcp.prestashop_client import PrestaShopClient, PrestaShopAPIError
+from src.prestashop_mcp.prestashop_client import PrestaShopClient
+
+
+@functools.lru_cache(maxsize=1)
+def _get_config() -> Config:
+    """Load the configuration once per process, however many testers are built."""
+    return Config()
+
+
+# TESTS_VERBOSE=0 silences the per-section report, e.g. in CI where it is discarded
+VERBOSE = os.environ.get("TESTS_VERBOSE", "1") == "1"
+
+# Output of the test section running in the current task; concurrent sections
+# each write to their own buffer, flushed in one piece when the section ends
+_section_output = ContextVar("_section_output", default=None)
+
+
+def _emit_to_buffer(*values):
+    """print() into the current section's buffer, or to stdout outside a section."""
+    buffer = _section_output.get()
+    print(*values, file=buffer if buffer is not None else sys.stdout)
+
+
+def _discard(*values):
+    """Drop section output when TESTS_VERBOSE=0."""
+
+
+# Resolved once at import instead of checking VERBOSE on every call
+_emit = _emit_to_buffer if VERBOSE else _discard
+
+
+def _print_modules(modules):
+    if isinstance(modules, list) and len(modules) > 0:
+        _emit(f"   Found {len(modules)} modules")
+        for module in modules[:3]:  # Show first 3
+            name = module.get('name', 'N/A')
+            active = module.get('active', 'N/A')
+            _emit(f"   - {name} (Active: {active})")
+        if len(modules) > 3:
+            _emit(f"   ... and {len(modules) - 3} more")
+    else:
+        _emit(f"   Modules data: {modules}")
+
+
+def _print_main_menu(menu_configs):
+    _emit(f"   Found {len(menu_configs)} menu configurations")
+    for key in islice(menu_configs, 3):
+        _emit(f"   - {key}")
+
+
+def _print_cache_status(cache_status):
+    enabled_count = sum(1 for status in cache_status.values() 
+                      if type(status) is dict and status.get('enabled'))
+    _emit(f"   Cache configs: {len(cache_status)}, Enabled: {enabled_count}")
+
+
+def _print_themes(themes):
+    _emit(f"   Theme configurations: {len(themes)}")
+    for key, value in islice(themes.items(), 3):
+        _emit(f"   - {key}: {value}")
+
+
+def _print_message(message):
+    _emit(f"   Message: {message}")
+
+
+# Result key -> printer for its value, probed in this order
+_PRINTERS = {
+    'modules': _print_modules,
+    'main_menu': _print_main_menu,
+    'cache_status': _print_cache_status,
+    'themes': _print_themes,
+    'message': _print_message,
+}
+
+# Value type -> summary for the generic result display; other types are skipped
+_VALUE_FORMATTERS = {
+    str: str,
+    int: str,
+    bool: str,
+    list: lambda value: f"List with {len(value)} items",
+    dict: lambda value: f"Dict with {len(value)} keys",
+}
 
 
 class ExtendedFunctionalityTester:
     """Test class for PrestaShop MCP Extended Functionality."""
     
+    __slots__ = ("config",)
+    
     def __init__(self):
         """Initialize with configuration."""
         try:
-            self.config = Config()
+            self.config = config = _get_config()
+            api_key = config.api_key
             print(f"✅ Configuration loaded successfully")
-            print(f"🏪 Shop URL: {self.config.shop_url}")
-            print(f"🔑 API Key: {self.config.api_key[:8]}..." if self.config.api_key else "❌ No API Key")
+            print(f"🏪 Shop URL: {config.shop_url}")
+            print(f"🔑 API Key: {api_key[:8]}..." if api_key else "❌ No API Key")
         except Exception as e:
             print(f"❌ Configuration error: {e}")
             raise
     
     def print_section(self, title: str):
         """Print formatted section header."""
-        print(f"\n{'='*60}")
-        print(f"🧪 {title}")
-        print('='*60)
+        _emit(f"\n{'='*60}")
+        _emit(f"🧪 {title}")
+        _emit('='*60)
     
     def print_result(self, operation: str, result: Dict[str, Any], success: bool = True):
         """Print formatted test result."""
         status = "✅" if success else "❌"
-        print(f"{status} {operation}")
+        _emit(f"{status} {operation}")
         
         if isinstance(result, dict):
             if 'error' in result:
-                print(f"   Error: {result['error']}")
-            else:
-                # Print key information based on operation type
-                if 'modules' in result:
-                    modules = result['modules']
-                    if isinstance(modules, list) and len(modules) > 0:
-                        print(f"   Found {len(modules)} modules")
-                        for module in modules[:3]:  # Show first 3
-                            name = module.get('name', 'N/A')
-                            active = module.get('active', 'N/A')
-                            print(f"   - {name} (Active: {active})")
-                        if len(modules) > 3:
-                            print(f"   ... and {len(modules) - 3} more")
-                    else:
-                        print(f"   Modules data: {modules}")
-                
-                elif 'main_menu' in result:
-                    menu_configs = result['main_menu']
-                    print(f"   Found {len(menu_configs)} menu configurations")
-                    for key in list(menu_configs.keys())[:3]:
-                        print(f"   - {key}")
-                
-                elif 'cache_status' in result:
-                    cache_status = result['cache_status']
-                    enabled_count = sum(1 for status in cache_status.values() 
-                                      if isinstance(status, dict) and status.get('enabled'))
-                    print(f"   Cache configs: {len(cache_status)}, Enabled: {enabled_count}")
-                
-                elif 'themes' in result:
-                    themes = result['themes']
-                    print(f"   Theme configurations: {len(themes)}")
-                    for key, value in list(themes.items())[:3]:
-                        print(f"   - {key}: {value}")
-                
-                elif 'message' in result:
-                    print(f"   Message: {result['message']}")
-                
-                else:
-                    # Generic result display
-                    for key, value in list(result.items())[:5]:
-                        if isinstance(value, (str, int, bool)):
-                            print(f"   {key}: {value}")
-                        elif isinstance(value, list):
-                            print(f"   {key}: List with {len(value)} items")
-                        elif isinstance(value, dict):
-                            print(f"   {key}: Dict with {len(value)} keys")
+                _emit(f"   Error: {result['error']}")
+                return
+            # Print key information based on operation type
+            for key, printer in _PRINTERS.items():
+                if key in result:
+                    printer(result[key])
+                    return
+            # Generic result display, emitted as one joined block
+            lines = [
+                f"   {key}: {_VALUE_FORMATTERS[type(value)](value)}"
+                for key, value in islice(result.items(), 5)
+                if type(value) in _VALUE_FORMATTERS
+            ]
+            if lines:
+                _emit("\n".join(lines))
         else:
-            print(f"   Result: {result}")
+            _emit(f"   Result: {result}")
     
-    async def test_module_management(self):
+    async def test_module_management(self, client: PrestaShopClient):
         """Test module management functionality."""
         self.print_section("MODULE MANAGEMENT TESTS")
         
-        async with PrestaShopClient(self.config) as client:
-            
-            # Test 1: Get all modules
-            print("\n1. Testing get_modules...")
-            try:
-                result = await client.get_modules(limit=5)
-                self.print_result("Get modules (limit 5)", result)
-            except Exception as e:
-                self.print_result("Get modules", {"error": str(e)}, False)
-            
-            # Test 2: Get specific module by name
-            print("\n2. Testing get_module_by_name...")
-            try:
-                result = await client.get_module_by_name("ps_mainmenu")
-                self.print_result("Get ps_mainmenu module details", result)
-            except Exception as e:
-                self.print_result("Get module by name", {"error": str(e)}, False)
-            
-            # Test 3: Get module status (if module exists)
-            print("\n3. Testing module status check...")
-            try:
-                result = await client.get_module_by_name("blockcart")
-                if 'module' in result:
-                    module_data = result['module']
-                    status = module_data.get('active', 'unknown')
-                    print(f"   Module 'blockcart' status: {status}")
-                else:
-                    print("   Module 'blockcart' not found - this is normal")
-                self.print_result("Check module status", result)
-            except Exception as e:
-                self.print_result("Check module status", {"error": str(e)}, False)
-            
-            # Note: We avoid testing install/activate operations to prevent 
-            # unintended changes to the live store
-            print("\n   ℹ️  Note: Module install/activate tests skipped for safety")
+        # The three lookups are independent, so they are sent together and
+        # reported in order
+        modules, mainmenu, blockcart = await asyncio.gather(
+            client.get_modules(limit=5),
+            client.get_module_by_name("ps_mainmenu"),
+            client.get_module_by_name("blockcart"),
+            return_exceptions=True
+        )
+        
+        # Test 1: Get all modules
+        _emit("\n1. Testing get_modules...")
+        if isinstance(modules, Exception):
+            self.print_result("Get modules", {"error": str(modules)}, False)
+        else:
+            self.print_result("Get modules (limit 5)", modules)
+        
+        # Test 2: Get specific module by name
+        _emit("\n2. Testing get_module_by_name...")
+        if isinstance(mainmenu, Exception):
+            self.print_result("Get module by name", {"error": str(mainmenu)}, False)
+        else:
+            self.print_result("Get ps_mainmenu module details", mainmenu)
+        
+        # Test 3: Get module status (if module exists)
+        _emit("\n3. Testing module status check...")
+        if isinstance(blockcart, Exception):
+            self.print_result("Check module status", {"error": str(blockcart)}, False)
+        else:
+            if 'module' in blockcart:
+                module_data = blockcart['module']
+                status = module_data.get('active', 'unknown')
+                _emit(f"   Module 'blockcart' status: {status}")
+            else:
+                _emit("   Module 'blockcart' not found - this is normal")
+            self.print_result("Check module status", blockcart)
+        
+        # Note: We avoid testing install/activate operations to prevent 
+        # unintended changes to the live store
+        _emit("\n   ℹ️  Note: Module install/activate tests skipped for safety")
     
-    async def test_main_menu_management(self):
+    async def test_main_menu_management(self, client: PrestaShopClient):
         """Test main menu (ps_mainmenu) management functionality."""
         self.print_section("MAIN MENU MANAGEMENT TESTS")
         
-        async with PrestaShopClient(self.config) as client:
-            
-            # Test 1: Get main menu links
-            print("\n1. Testing get_main_menu_links...")
-            try:
-                result = await client.get_main_menu_links()
-                self.print_result("Get main menu links", result)
-            except Exception as e:
-                self.print_result("Get main menu links", {"error": str(e)}, False)
-            
-            # Note: We avoid testing add/update operations to prevent 
-            # unintended changes to the navigation
-            print("\n   ℹ️  Note: Menu modification tests skipped for safety")
+        # Test 1: Get main menu links
+        _emit("\n1. Testing get_main_menu_links...")
+        try:
+            result = await client.get_main_menu_links()
+            self.print_result("Get main menu links", result)
+        except Exception as e:
+            self.print_result("Get main menu links", {"error": str(e)}, False)
+        
+        # Note: We avoid testing add/update operations to prevent 
+        # unintended changes to the navigation
+        _emit("\n   ℹ️  Note: Menu modification tests skipped for safety")
     
-    async def test_cache_management(self):
+    async def test_cache_management(self, client: PrestaShopClient):
         """Test cache management functionality."""
         self.print_section("CACHE MANAGEMENT TESTS")
         
-        async with PrestaShopClient(self.config) as client:
-            
-            # Test 1: Get cache status
-            print("\n1. Testing get_cache_status...")
-            try:
-                result = await client.get_cache_status()
-                self.print_result("Get cache status", result)
-            except Exception as e:
-                self.print_result("Get cache status", {"error": str(e)}, False)
-            
-            # Note: We avoid testing cache clear to prevent performance impact
-            print("\n   ℹ️  Note: Cache clear test skipped to avoid performance impact")
+        # Test 1: Get cache status
+        _emit("\n1. Testing get_cache_status...")
+        try:
+            result = await client.get_cache_status()
+            self.print_result("Get cache status", result)
+        except Exception as e:
+            self.print_result("Get cache status", {"error": str(e)}, False)
+        
+        # Note: We avoid testing cache clear to prevent performance impact
+        _emit("\n   ℹ️  Note: Cache clear test skipped to avoid performance impact")
     
-    async def test_theme_management(self):
+    async def test_theme_management(self, client: PrestaShopClient):
         """Test theme management functionality."""
         self.print_section("THEME MANAGEMENT TESTS")
         
-        async with PrestaShopClient(self.config) as client:
-            
-            # Test 1: Get themes
-            print("\n1. Testing get_themes...")
-            try:
-                result = await client.get_themes()
-                self.print_result("Get theme information", result)
-            except Exception as e:
-                self.print_result("Get themes", {"error": str(e)}, False)
-            
-            # Note: We avoid testing theme setting updates to prevent visual changes
-            print("\n   ℹ️  Note: Theme setting modification tests skipped for safety")
+        # Test 1: Get themes
+        _emit("\n1. Testing get_themes...")
+        try:
+            result = await client.get_themes()
+            self.print_result("Get theme information", result)
+        except Exception as e:
+            self.print_result("Get themes", {"error": str(e)}, False)
+        
+        # Note: We avoid testing theme setting updates to prevent visual changes
+        _emit("\n   ℹ️  Note: Theme setting modification tests skipped for safety")
     
-    async def test_enhanced_configurations(self):
+    async def test_enhanced_configurations(self, client: PrestaShopClient):
         """Test enhanced configuration access."""
         self.print_section("ENHANCED CONFIGURATION TESTS")
         
-        async with PrestaShopClient(self.config) as client:
-            
-            # Test 1: Get specific configuration groups
-            print("\n1. Testing configuration filters...")
-            
-            config_filters = ["PS_SHOP_", "PS_THEME_", "PS_CACHE_"]
-            
-            for filter_name in config_filters:
-                try:
-                    result = await client.get_configurations(filter_name=filter_name)
-                    if 'configurations' in result:
-                        count = len(result['configurations'])
-                        print(f"   ✅ {filter_name}* configurations: {count}")
-                    else:
-                        print(f"   ❌ No configurations found for {filter_name}")
-                except Exception as e:
-                    print(f"   ❌ Error getting {filter_name} configs: {e}")
+        # Test 1: Get specific configuration groups
+        _emit("\n1. Testing configuration filters...")
+        
+        config_filters = ["PS_SHOP_", "PS_THEME_", "PS_CACHE_"]
+        
+        # The filtered lookups are independent, so they are sent together
+        results = await asyncio.gather(
+            *(client.get_configurations(filter_name=filter_name) for filter_name in config_filters),
+            return_exceptions=True
+        )
+        
+        for filter_name, result in zip(config_filters, results):
+            if isinstance(result, Exception):
+                _emit(f"   ❌ Error getting {filter_name} configs: {result}")
+            elif 'configurations' in result:
+                count = len(result['configurations'])
+                _emit(f"   ✅ {filter_name}* configurations: {count}")
+            else:
+                _emit(f"   ❌ No configurations found for {filter_name}")
     
-    async def test_api_robustness(self):
+    async def test_api_robustness(self, client: PrestaShopClient):
         """Test API robustness and error handling."""
         self.print_section("API ROBUSTNESS TESTS")
         
-        async with PrestaShopClient(self.config) as client:
-            
-            # Test 1: Non-existent module
-            print("\n1. Testing non-existent module handling...")
-            try:
-                result = await client.get_module_by_name("non_existent_module_xyz")
-                if 'error' in result:
-                    print("   ✅ Correctly handled non-existent module")
-                else:
-                    print("   ⚠️  Unexpected response for non-existent module")
-                self.print_result("Non-existent module test", result)
-            except Exception as e:
-                self.print_result("Non-existent module test", {"error": str(e)}, False)
-            
-            # Test 2: Invalid configuration requests
-            print("\n2. Testing invalid configuration handling...")
-            try:
-                result = await client.get_configurations(filter_name="INVALID_CONFIG_XYZ")
-                self.print_result("Invalid configuration filter test", result)
-            except Exception as e:
-                self.print_result("Invalid configuration test", {"error": str(e)}, False)
+        # Both edge cases are independent lookups, so they are sent together
+        missing_module, invalid_config = await asyncio.gather(
+            client.get_module_by_name("non_existent_module_xyz"),
+            client.get_configurations(filter_name="INVALID_CONFIG_XYZ"),
+            return_exceptions=True
+        )
+        
+        # Test 1: Non-existent module
+        _emit("\n1. Testing non-existent module handling...")
+        if isinstance(missing_module, Exception):
+            self.print_result("Non-existent module test", {"error": str(missing_module)}, False)
+        else:
+            if 'error' in missing_module:
+                _emit("   ✅ Correctly handled non-existent module")
+            else:
+                _emit("   ⚠️  Unexpected response for non-existent module")
+            self.print_result("Non-existent module test", missing_module)
+        
+        # Test 2: Invalid configuration requests
+        _emit("\n2. Testing invalid configuration handling...")
+        if isinstance(invalid_config, Exception):
+            self.print_result("Invalid configuration test", {"error": str(invalid_config)}, False)
+        else:
+            self.print_result("Invalid configuration filter test", invalid_config)
 
     async def run_all_tests(self):
         """Run all extended functionality tests."""
         print("🚀 Starting Extended Functionality Tests for PrestaShop MCP v3.0.0")
-        print(f"📅 Testing at: {asyncio.get_event_loop().time()}")
+        print(f"📅 Testing at: {asyncio.get_running_loop().time()}")
         
         test_methods = [
             self.test_module_management,
@@ -243,13 +310,40 @@ class ExtendedFunctionalityTester:
             self.test_api_robustness
         ]
         
-        for test_method in test_methods:
+        durations = {}
+        
+        async def run_section(test_method):
+            # gather runs each section in its own task, so this buffer is
+            # private to it and its output is never interleaved
+            buffer = io.StringIO()
+            _section_output.set(buffer)
+            started = time.perf_counter()
             try:
-                await test_method()
-                await asyncio.sleep(0.5)  # Brief pause between test sections
-            except Exception as e:
+                await test_method(client)
+            finally:
+                durations[test_method.__name__] = time.perf_counter() - started
+                sys.stdout.write(buffer.getvalue())
+        
+        # One client for every section, so they all reuse its connection pool;
+        # the sections are independent reads, so they run concurrently
+        started = time.perf_counter()
+        async with PrestaShopClient(self.config) as client:
+            results = await asyncio.gather(
+                *(run_section(test_method) for test_method in test_methods),
+                return_exceptions=True
+            )
+        elapsed = time.perf_counter() - started
+        
+        for test_method, result in zip(test_methods, results):
+            if isinstance(result, Exception):
                 print(f"\n❌ Test section failed: {test_method.__name__}")
-                print(f"   Error: {e}")
+                print(f"   Error: {result}")
+        
+        # Timings are printed even with TESTS_VERBOSE=0, so runs can be compared
+        print("\n⏱️  Section timings:")
+        for test_method in test_methods:
+            print(f"   {test_method.__name__}: {durations[test_method.__name__]:.3f}s")
+        print(f"   Total (concurrent): {elapsed:.3f}s")
         
         print(f"\n{'='*60}")
         print("🏁 Extended Functionality Tests Complete")
@@ -279,4 +373,11 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is None:
+        asyncio.run(main())
+    elif sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            runner.run(main())
+    else:
+        uvloop.install()
+        asyncio.run(main())
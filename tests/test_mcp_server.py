@@ -0,0 +1,210 @@
+"""Tests for PrestaShop MCP server helpers."""
+
+import asyncio
+import base64
+import json
+
+import pytest
+
+from src.prestashop_mcp import prestashop_mcp_server as server_module
+from src.prestashop_mcp.prestashop_mcp_server import (
+    _API_ERROR_TEMPLATE,
+    _DISPATCH,
+    _TOOLS,
+    _encode_result,
+    _error_text,
+)
+
+
+class FakeDiskCache(dict):
+    """In-memory stand-in for diskcache.Cache, keeping each entry's tag."""
+
+    def get(self, key, default=None):
+        entry = super().get(key)
+        return default if entry is None else entry[0]
+
+    def set(self, key, value, expire=None, tag=None):
+        self[key] = (value, tag)
+
+    def evict(self, tag):
+        for key in [key for key, (_, entry_tag) in self.items() if entry_tag == tag]:
+            del self[key]
+
+
+@pytest.fixture(autouse=True)
+def empty_result_caches():
+    """Keep cached tool results from leaking between tests."""
+    yield
+    for cache in server_module._RESULT_CACHES.values():
+        cache.clear()
+
+
+class TestServerHelpers:
+    """Test result encoding and tool registration."""
+
+    def test_encode_result_round_trip(self):
+        """Test encoded results decode back to the original data."""
+        result = {"products": [{"id": 1, "name": "Café \"Deluxe\""}], "count": None}
+        assert json.loads(_encode_result(result)) == result
+
+    def test_encode_result_stdlib_fallback(self, monkeypatch):
+        """Test encoding still works when orjson is unavailable."""
+        monkeypatch.setattr(server_module, "orjson", None)
+        result = {"status": "success", "items": [1, 2, 3]}
+        assert _encode_result(result) == json.dumps(result, separators=(",", ":"))
+
+    def test_error_text_matches_json_dumps(self):
+        """Test error templates produce the same JSON as building the dict."""
+        error = Exception('bad "value"\nwith newline and ümläut')
+        expected = json.dumps(
+            {"error": f"PrestaShop API Error: {error}", "type": "api_error"},
+            separators=(",", ":")
+        )
+        assert _error_text(_API_ERROR_TEMPLATE, error) == expected
+
+    def test_every_tool_has_a_handler(self):
+        """Test the dispatch table covers exactly the advertised tools."""
+        assert set(_DISPATCH) == {tool.name for tool in _TOOLS}
+
+    def test_invalid_arguments_rejected_before_dispatch(self, monkeypatch):
+        """Test compiled validators reject arguments that violate the schema."""
+        pytest.importorskip("fastjsonschema")
+
+        def fail_get_client():
+            raise AssertionError("client must not be used for invalid arguments")
+
+        monkeypatch.setattr(server_module, "_get_client", fail_get_client)
+        content = asyncio.run(
+            server_module.handle_call_tool("create_product", {"name": "Test"})
+        )
+        result = json.loads(content[0].text)
+        assert result["type"] == "validation_error"
+        assert "price" in result["error"]
+
+    def test_concurrent_identical_reads_share_one_request(self, monkeypatch):
+        """Test identical in-flight read-only calls are coalesced."""
+        calls = []
+
+        class FakeClient:
+            async def get_categories(self, limit=10, parent_id=None):
+                calls.append((limit, parent_id))
+                await asyncio.sleep(0.01)
+                return {"categories": [{"id": 2}]}
+
+        monkeypatch.setattr(server_module, "_get_client", lambda: FakeClient())
+
+        async def run():
+            return await asyncio.gather(*(
+                server_module.handle_call_tool("get_categories", {"limit": 5})
+                for _ in range(3)
+            ))
+
+        responses = asyncio.run(run())
+        assert calls == [(5, None)]
+        assert all(json.loads(r[0].text) == {"categories": [{"id": 2}]} for r in responses)
+        assert server_module._INFLIGHT == {}
+
+    def test_write_tools_invalidate_cached_reads(self, monkeypatch):
+        """Test cached read results are dropped once a write tool runs."""
+        calls = []
+
+        class FakeClient:
+            async def get_orders(self, limit=10, customer_id=None, status=None, raw=False):
+                calls.append("get_orders")
+                return {"orders": [{"id": len(calls)}]}
+
+            async def update_order_status(self, order_id, status_id):
+                calls.append("update_order_status")
+                return {"order_history": {"id_order": order_id}}
+
+        monkeypatch.setattr(server_module, "_get_client", lambda: FakeClient())
+
+        async def run():
+            await server_module.handle_call_tool("get_orders", {})
+            await server_module.handle_call_tool("get_orders", {})
+            await server_module.handle_call_tool(
+                "update_order_status", {"order_id": "1", "status_id": "2"}
+            )
+            return await server_module.handle_call_tool("get_orders", {})
+
+        content = asyncio.run(run())
+        assert calls == ["get_orders", "update_order_status", "get_orders"]
+        assert json.loads(content[0].text) == {"orders": [{"id": 3}]}
+
+    def test_persisted_results_survive_memory_cache(self, monkeypatch):
+        """Test persisted tool results are served from the disk cache after a restart."""
+        calls = []
+
+        class FakeClient:
+            class config:
+                shop_url = "https://test-shop.example.com"
+
+            async def get_order_states(self):
+                calls.append("get_order_states")
+                return {"order_states": [{"id": 1}]}
+
+        disk = FakeDiskCache()
+        monkeypatch.setattr(server_module, "_disk_cache", disk)
+        monkeypatch.setattr(server_module, "_get_client", lambda: FakeClient())
+
+        first = asyncio.run(server_module.handle_call_tool("get_order_states", {}))
+        server_module._RESULT_CACHES["get_order_states"].clear()
+        second = asyncio.run(server_module.handle_call_tool("get_order_states", {}))
+        assert calls == ["get_order_states"]
+        assert first[0].text == second[0].text
+        assert list(disk) == [("https://test-shop.example.com", "get_order_states")]
+
+    def test_write_keeps_startup_probe_marker(self, monkeypatch, capsys):
+        """Test write tools evict persisted results but not the probe marker."""
+        calls = []
+
+        class FakeClient:
+            class config:
+                shop_url = "https://test-shop.example.com"
+                api_key = "test-key"
+
+            async def check_connection(self):
+                calls.append("check_connection")
+
+            async def get_order_states(self):
+                return {"order_states": [{"id": 1}]}
+
+            async def update_order_status(self, order_id, status_id):
+                return {"order_history": {"id_order": order_id}}
+
+        client = FakeClient()
+        disk = FakeDiskCache()
+        monkeypatch.setattr(server_module, "_disk_cache", disk)
+        monkeypatch.setattr(server_module, "_get_client", lambda: client)
+
+        async def run():
+            await server_module._check_api_connection(client)
+            await server_module.handle_call_tool("get_order_states", {})
+            await server_module.handle_call_tool(
+                "update_order_status", {"order_id": "1", "status_id": "2"}
+            )
+            await server_module._check_api_connection(client)
+
+        asyncio.run(run())
+        assert calls == ["check_connection"]
+        assert "skipped" in capsys.readouterr().err
+        assert [key for key in disk if isinstance(key, tuple)] == []
+
+    def test_msgpack_result_for_negotiating_client(self, monkeypatch):
+        """Test results are MessagePack blobs when the client negotiated them."""
+        msgpack = pytest.importorskip("msgpack")
+
+        class FakeClient:
+            async def install_module(self, module_name):
+                return {"module": {"name": module_name, "active": "1"}}
+
+        monkeypatch.setattr(server_module, "_get_client", lambda: FakeClient())
+        monkeypatch.setattr(server_module, "_client_accepts_msgpack", lambda: True)
+        content = asyncio.run(
+            server_module.handle_call_tool("install_module", {"module_name": "ps_banner"})
+        )
+        resource = content[0].resource
+        assert resource.mimeType == "application/msgpack"
+        assert msgpack.unpackb(base64.b64decode(resource.blob)) == {
+            "module": {"name": "ps_banner", "active": "1"}
+        }
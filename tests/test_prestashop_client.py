@@ -0,0 +1,430 @@
+"""Tests for PrestaShop API client request patterns."""
+
+import asyncio
+
+import pytest
+
+from src.prestashop_mcp import prestashop_client as client_module
+from src.prestashop_mcp.config import Config
+from src.prestashop_mcp.prestashop_client import PrestaShopAPIError, PrestaShopClient
+
+
+class RecordingClient(PrestaShopClient):
+    """Client that answers API requests from canned responses."""
+
+    def __init__(self, responses, delay: float = 0):
+        super().__init__(Config(shop_url="https://test-shop.example.com", api_key="test-key"))
+        self.responses = responses
+        self.delay = delay
+        self.requests = []
+        self.bodies = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def _send_request(self, method, endpoint, params=None, data=None, raw=False):
+        self.requests.append((method, endpoint, dict(params or {})))
+        self.bodies.append(data)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        response = self.responses[(method, endpoint)]
+        return response(params or {}) if callable(response) else response
+
+
+class TestProductEnhancement:
+    """Test product listing enhancement."""
+
+    def test_enhancement_runs_concurrently_and_keeps_order(self):
+        """Test per-product detail fetches overlap and results keep listing order."""
+        ids = [str(i) for i in range(1, 6)]
+        responses = {("GET", "products"): {"products": [{"id": i} for i in ids]}}
+        for i in ids:
+            responses[("GET", f"products/{i}")] = {"product": {"id": i, "name": f"P{i}"}}
+        client = RecordingClient(responses, delay=0.01)
+
+        result = asyncio.run(client.get_products(limit=5, include_details=True))
+        assert [p["product"]["id"] for p in result["products"]] == ids
+        assert client.peak_in_flight == len(ids)
+
+    def test_enrichment_only_fetches_narrow_fields(self):
+        """Test stock/category enrichment without details requests a projection."""
+        responses = {
+            ("GET", "products"): lambda params: {"products": [{"id": "1"}]},
+            ("GET", "products/1"): lambda params: {"product": {"id": "1", "id_category_default": "2"}},
+            ("GET", "stock_availables"): {"stock_availables": [{"quantity": "4"}]},
+        }
+        client = RecordingClient(responses)
+        asyncio.run(client.get_products(limit=1, include_stock=True))
+        assert ("GET", "products/1", {"display": PrestaShopClient.ENRICHMENT_DISPLAY}) in client.requests
+
+        client = RecordingClient(responses)
+        asyncio.run(client.get_products(limit=1, include_details=True, include_stock=True))
+        assert ("GET", "products/1", {}) in client.requests
+
+    def test_listing_stock_fetched_in_one_request(self):
+        """Test stock for a whole page comes from one IN-filtered request."""
+        responses = {
+            ("GET", "products"): {"products": [{"id": 1}, {"id": 2}, {"id": 3}]},
+            ("GET", "stock_availables"): {"stock_availables": [
+                {"id_product": "1", "quantity": "5"},
+                {"id_product": "1", "quantity": "2"},
+                {"id_product": "2", "quantity": "0"},
+            ]},
+        }
+        for i in (1, 2, 3):
+            responses[("GET", f"products/{i}")] = {"product": {"id": str(i)}}
+        client = RecordingClient(responses)
+
+        result = asyncio.run(client.get_products(limit=3, include_stock=True))
+        stock_requests = [r for r in client.requests if r[1] == "stock_availables"]
+        assert stock_requests == [(
+            "GET", "stock_availables", {"filter[id_product]": "[1|2|3]", "display": "full"}
+        )]
+        assert [p["stock_info"] for p in result["products"]] == [
+            {"id_product": "1", "quantity": "5"},
+            {"id_product": "2", "quantity": "0"},
+            {"error": "Stock information not available"},
+        ]
+
+    def test_stock_prefers_product_row_over_combinations(self):
+        """Test products with combinations report their id_product_attribute 0 row."""
+        rows = [
+            {"id_product": "1", "id_product_attribute": "5", "quantity": "3"},
+            {"id_product": "1", "id_product_attribute": "0", "quantity": "10"},
+            {"id_product": "2", "id_product_attribute": "8", "quantity": "1"},
+        ]
+        responses = {
+            ("GET", "products"): {"products": [{"id": 1}, {"id": 2}]},
+            ("GET", "products/1"): {"product": {"id": "1"}},
+            ("GET", "products/2"): {"product": {"id": "2"}},
+            ("GET", "stock_availables"): lambda params: {"stock_availables": [
+                row for row in rows if params["filter[id_product]"] in ("[1|2]", row["id_product"])
+            ]},
+        }
+        client = RecordingClient(responses)
+
+        listing = asyncio.run(client.get_products(limit=2, include_stock=True))
+        single = asyncio.run(client.get_products(product_id="1", include_stock=True))
+        assert [p["stock_info"]["quantity"] for p in listing["products"]] == ["10", "1"]
+        assert single["stock_info"]["quantity"] == "10"
+
+    def test_single_product_lookups_overlap(self):
+        """Test stock and category info for one product are fetched concurrently."""
+        responses = {
+            ("GET", "products/1"): lambda params: {"product": {"id": "1", "id_category_default": "2"}},
+            ("GET", "stock_availables"): {"stock_availables": [{"quantity": "4"}]},
+            ("GET", "categories/2"): {"category": {"id": "2"}},
+        }
+        client = RecordingClient(responses, delay=0.01)
+
+        result = asyncio.run(client.get_products(
+            product_id="1", include_stock=True, include_category_info=True
+        ))
+        assert result["stock_info"] == {"quantity": "4"}
+        assert result["category_info"] == {"id": "2"}
+        # The product GET runs alone; stock and category are then pending together
+        assert client.peak_in_flight == 2
+
+    def test_listing_categories_fetched_in_one_request(self):
+        """Test distinct default categories of a page come from one IN-filtered request."""
+        responses = {
+            ("GET", "products"): {"products": [{"id": 1}, {"id": 2}, {"id": 3}]},
+            ("GET", "products/1"): {"product": {"id": "1", "id_category_default": "4"}},
+            ("GET", "products/2"): {"product": {"id": "2", "id_category_default": "4"}},
+            ("GET", "products/3"): {"product": {"id": "3", "id_category_default": "9"}},
+            ("GET", "categories"): {"categories": [{"id": 4, "name": "Shoes"}]},
+        }
+        client = RecordingClient(responses)
+
+        result = asyncio.run(client.get_products(limit=3, include_category_info=True))
+        category_requests = [r for r in client.requests if r[1].startswith("categories")]
+        assert category_requests == [
+            ("GET", "categories", {"filter[id]": "[4|9]", "display": "full"})
+        ]
+        assert [p["category_info"] for p in result["products"]] == [
+            {"id": 4, "name": "Shoes"},
+            {"id": 4, "name": "Shoes"},
+            {"error": "Category not found"},
+        ]
+
+
+class TestGetCache:
+    """Test caching of near-static resource GETs."""
+
+    def test_shared_category_fetched_once(self):
+        """Test products sharing a default category trigger a single category GET."""
+        ids = [str(i) for i in range(1, 5)]
+        responses = {("GET", "categories/3"): {"category": {"id": "3"}}}
+        for i in ids:
+            responses[("GET", f"products/{i}")] = {"product": {"id": i, "id_category_default": "3"}}
+        client = RecordingClient(responses, delay=0.01)
+
+        async def run():
+            return await asyncio.gather(*(
+                client.get_products(product_id=i, include_category_info=True) for i in ids
+            ))
+
+        results = asyncio.run(run())
+        assert all(r["category_info"] == {"id": "3"} for r in results)
+        assert [r[1] for r in client.requests].count("categories/3") == 1
+
+    def test_write_invalidates_resource(self):
+        """Test a category update drops cached category GETs."""
+        responses = {
+            ("GET", "categories/3"): {"category": {"id": "3", "name": []}},
+            ("PATCH", "categories/3"): {"category": {"id": "3"}},
+        }
+        client = RecordingClient(responses)
+
+        async def run():
+            await client._make_request("GET", "categories/3")
+            await client._make_request("GET", "categories/3")
+            await client.update_category("3", active=False)
+            await client._make_request("GET", "categories/3")
+
+        asyncio.run(run())
+        assert [r[0] for r in client.requests] == ["GET", "PATCH", "GET"]
+
+    def test_enrichment_does_not_leak_into_cached_response(self):
+        """Test parsed menu values are not written into the shared configurations response."""
+        responses = {("GET", "configurations"): {"configurations": [
+            {"id": "1", "name": "PS_MAINMENU_CONTENT_1", "value": '{"url": "/sale"}'}
+        ]}}
+        client = RecordingClient(responses)
+
+        async def run():
+            menu = await client.get_main_menu_links()
+            configs = await client.get_configurations(filter_name="PS_MAINMENU_CONTENT_")
+            return menu, configs
+
+        menu, configs = asyncio.run(run())
+        assert menu["main_menu"]["PS_MAINMENU_CONTENT_1"]["parsed_value"] == {"url": "/sale"}
+        assert len(client.requests) == 1
+        assert all("parsed_value" not in config for config in configs["configurations"])
+
+
+class TestPartialUpdates:
+    """Test PATCH-first updates with GET + PUT fallback."""
+
+    def test_update_product_patches_changed_fields_only(self):
+        """Test a supported PATCH is the only request of an update."""
+        client = RecordingClient({("PATCH", "products/7"): {"product": {"id": "7"}}})
+        assert asyncio.run(client.update_product_price("7", 19.9)) == {"product": {"id": "7"}}
+        assert [r[:2] for r in client.requests] == [("PATCH", "products/7")]
+
+    def test_unsupported_patch_falls_back_and_is_not_retried(self):
+        """Test shops rejecting PATCH get GET + PUT, and PATCH is skipped afterwards."""
+        def reject(params):
+            raise PrestaShopAPIError("Method not allowed", status=405)
+
+        client = RecordingClient({
+            ("PATCH", "categories/3"): reject,
+            ("GET", "categories/3"): {"category": {"id": "3", "id_parent": "2", "name": []}},
+            ("PUT", "categories/3"): {"category": {"id": "3"}},
+        })
+
+        async def run():
+            await client.update_category("3", active=False)
+            await client.update_category("3", active=True)
+
+        asyncio.run(run())
+        assert [r[:2] for r in client.requests] == [
+            ("PATCH", "categories/3"),
+            ("GET", "categories/3"),
+            ("PUT", "categories/3"),
+            ("GET", "categories/3"),
+            ("PUT", "categories/3"),
+        ]
+
+    def test_category_fallback_reads_past_get_cache(self):
+        """Test the GET + PUT fallback merges into the current category, not a cached one."""
+        client = RecordingClient({
+            ("GET", "categories/3"): {"category": {"id": "3", "id_parent": "2", "name": "Old"}},
+            ("PUT", "categories/3"): {"category": {"id": "3"}},
+        })
+
+        async def run():
+            await client._make_request("GET", "categories/3")
+            client._partial_updates_supported = False
+            client.responses[("GET", "categories/3")] = {
+                "category": {"id": "3", "id_parent": "5", "name": "Renamed elsewhere"}
+            }
+            await client.update_category("3", active=False)
+
+        asyncio.run(run())
+        put_body = client.bodies[-1]["category"]
+        assert put_body["name"] == "Renamed elsewhere"
+        assert put_body["id_parent"] == "5"
+        assert put_body["active"] == "0"
+
+    def test_disabled_patch_fallback_always_fetches_entity(self):
+        """Test updates after PATCH was disabled skip it and GET the entity every time."""
+        client = RecordingClient({
+            ("GET", "products/7"): {"product": {"id": "7", "price": "10"}},
+            ("PUT", "products/7"): {"product": {"id": "7"}},
+            ("GET", "categories/3"): {"category": {"id": "3", "id_parent": "2", "name": []}},
+            ("PUT", "categories/3"): {"category": {"id": "3"}},
+        })
+        client._partial_updates_supported = False
+
+        async def run():
+            await client._make_request("GET", "categories/3")
+            await client.update_product("7", price=12.5)
+            await client.update_category("3", active=True)
+
+        asyncio.run(run())
+        assert [r[:2] for r in client.requests] == [
+            ("GET", "categories/3"),
+            ("GET", "products/7"),
+            ("PUT", "products/7"),
+            ("GET", "categories/3"),
+            ("PUT", "categories/3"),
+        ]
+        assert client.bodies[2]["product"]["price"] == "12.5"
+
+
+class TestConnectionCheck:
+    """Test the lightweight connection check."""
+
+    def test_success_is_cached_briefly(self, monkeypatch):
+        """Test repeat checks within the TTL skip the HEAD request."""
+        now = [100.0]
+        monkeypatch.setattr(client_module.time, "monotonic", lambda: now[0])
+        client = RecordingClient({("HEAD", ""): {}})
+
+        asyncio.run(client.check_connection())
+        asyncio.run(client.check_connection())
+        now[0] += PrestaShopClient.CONNECTION_CHECK_TTL
+        asyncio.run(client.check_connection())
+        assert [r[:2] for r in client.requests] == [("HEAD", ""), ("HEAD", "")]
+
+
+class FakeResponse:
+    """Minimal aiohttp response stand-in."""
+
+    def __init__(self, status, body="", headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self._body = body
+
+    async def read(self):
+        return self._body.encode()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeSession:
+    """Session that replays a fixed sequence of responses."""
+
+    closed = False
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def request(self, **kwargs):
+        self.calls += 1
+        self.last_kwargs = kwargs
+        return self.responses.pop(0)
+
+
+class TestMakeRequest:
+    """Test low-level API request handling."""
+
+    def test_overloaded_request_is_retried_after_retry_after(self):
+        """Test 429/503 responses are retried and the eventual result returned."""
+        client = PrestaShopClient(Config(shop_url="https://test-shop.example.com", api_key="test-key"))
+        client.session = FakeSession([
+            FakeResponse(429, headers={"Retry-After": "0"}),
+            FakeResponse(503, headers={"Retry-After": "0"}),
+            FakeResponse(200, '{"products": []}'),
+        ])
+        assert asyncio.run(client._make_request("GET", "products")) == {"products": []}
+        assert client.session.calls == 3
+
+    def test_retries_exhausted_raises_api_error(self):
+        """Test the API error surfaces once retries are used up."""
+        client = PrestaShopClient(Config(shop_url="https://test-shop.example.com", api_key="test-key"))
+        client.session = FakeSession(
+            FakeResponse(503, "busy", {"Retry-After": "0"})
+            for _ in range(PrestaShopClient.MAX_RETRIES + 1)
+        )
+        with pytest.raises(PrestaShopAPIError, match="503"):
+            asyncio.run(client._make_request("GET", "products"))
+
+    def test_unavailable_write_is_not_retried(self):
+        """Test a 503 to a write surfaces at once, since the shop may have applied it."""
+        client = PrestaShopClient(Config(shop_url="https://test-shop.example.com", api_key="test-key"))
+        client.session = FakeSession([
+            FakeResponse(503, "busy", {"Retry-After": "0"}),
+            FakeResponse(200, '{"customer": {"id": "7"}}'),
+        ])
+        with pytest.raises(PrestaShopAPIError, match="503"):
+            asyncio.run(client._make_request("POST", "customers", data={"customer": {}}))
+        assert client.session.calls == 1
+
+    def test_rate_limited_write_is_retried(self):
+        """Test a 429 to a write is retried, as the request was never processed."""
+        client = PrestaShopClient(Config(shop_url="https://test-shop.example.com", api_key="test-key"))
+        client.session = FakeSession([
+            FakeResponse(429, headers={"Retry-After": "0"}),
+            FakeResponse(200, '{"customer": {"id": "7"}}'),
+        ])
+        result = asyncio.run(client._make_request("POST", "customers", data={"customer": {}}))
+        assert result == {"customer": {"id": "7"}}
+        assert client.session.calls == 2
+
+    def test_retry_after_is_capped(self):
+        """Test a long Retry-After waits at most MAX_RETRY_DELAY seconds."""
+        assert PrestaShopClient._retry_delay({"Retry-After": "3600"}, 0) == PrestaShopClient.MAX_RETRY_DELAY
+        assert PrestaShopClient._retry_delay({"Retry-After": "2"}, 0) == 2
+
+    def test_auth_header_encodes_api_key(self):
+        """Test the prebuilt Authorization header is Basic auth with an empty password."""
+        client = PrestaShopClient(Config(shop_url="https://test-shop.example.com", api_key="test-key"))
+        assert client.auth_header == "Basic dGVzdC1rZXk6"
+
+    def test_caller_params_are_not_mutated(self):
+        """Test output_format is added to the sent params, not the caller's dict."""
+        client = PrestaShopClient(Config(shop_url="https://test-shop.example.com", api_key="test-key"))
+        client.session = FakeSession([FakeResponse(200, "{}")])
+        params = {"limit": 5}
+        asyncio.run(client._make_request("GET", "products", params=params))
+        assert params == {"limit": 5}
+        assert client.session.last_kwargs["params"] == {"limit": 5, "output_format": "JSON"}
+
+    def test_non_json_body_returned_raw(self):
+        """Test bodies that are not JSON come back as raw_response."""
+        client = PrestaShopClient(Config(shop_url="https://test-shop.example.com", api_key="test-key"))
+        client.session = FakeSession([FakeResponse(200, "<html>maintenance</html>")])
+        assert asyncio.run(client._make_request("GET", "products")) == {
+            "raw_response": "<html>maintenance</html>"
+        }
+
+    def test_raw_request_passes_json_text_through(self):
+        """Test raw=True returns the upstream JSON text without decoding it."""
+        body = '{"orders":[{"id":1,"reference":"ABC"}]}'
+        client = PrestaShopClient(Config(shop_url="https://test-shop.example.com", api_key="test-key"))
+        client.session = FakeSession([FakeResponse(200, body)])
+        result = asyncio.run(client.get_orders(limit=1, raw=True))
+        assert isinstance(result, client_module.RawJSON)
+        assert result == body
+
+
+class TestLinkRewrite:
+    """Test link_rewrite generation."""
+
+    def test_generate_link_rewrite(self):
+        """Test ASCII and non-ASCII names produce the same slugs as before."""
+        client = PrestaShopClient(Config(shop_url="https://test-shop.example.com", api_key="test-key"))
+        assert client._generate_link_rewrite("  Summer  Sale -50%! ") == "summer-sale-50"
+        assert client._generate_link_rewrite("Café Crème　Bio") == "caf-crme-bio"
+        assert client._generate_link_rewrite("!!!") == ""